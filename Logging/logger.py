@@ -2,7 +2,8 @@ import logging
 import os
 
 def get_logger(name: str):
-    log_dir = 'logs'
+    # SCM_LOG_DIR redirects the log files (the test suite points it at a temporary folder)
+    log_dir = os.environ.get('SCM_LOG_DIR', 'logs')
     os.makedirs(log_dir, exist_ok=True)
 
     logger = logging.getLogger(name)
@@ -12,7 +13,8 @@ def get_logger(name: str):
     if logger.hasHandlers():
         logger.handlers.clear()
 
-    file_handler = logging.FileHandler(os.path.join(log_dir, f'{name}.log'))
+    # delay: the file is only opened (and created) when the first record is written
+    file_handler = logging.FileHandler(os.path.join(log_dir, f'{name}.log'), delay=True)
     file_handler.setLevel(logging.INFO)
 
     console_handler = logging.StreamHandler()
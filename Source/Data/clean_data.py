@@ -3,34 +3,31 @@ import numpy as np
 import os
 import re
 import sys
-import matplotlib.pyplot as plt
-import seaborn as sns
+import tracemalloc
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from Source.Utils.helpers import load_data
+from Source.Utils.helpers import add_calendar_features
+from Source.Utils.storage import save_dataset, resolve_path
+from Source.Utils.series import partition_series
+from Source.Data.district_lookup import get_district_lookup
 from Logging.logger import get_logger
 import json
-from datetime import datetime 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from Source.Database.db_con import get_engine
 
 # ----------------------------Config File------------------------------#
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-with open(os.path.join(PROJECT_ROOT, 'Source', 'config.json'), "r") as f:
-    config = json.load(f)
 
 
 # ----------------------------Log File---------------------------------#
 logger = get_logger("SCM-Data-Clean")
 
-
-# ----------------------------State File Config Path ------------------# 
-state_district_df = load_data(config[r'state_district'])
-
 class DataCleaner:
-    def __init__(self, config_path):
+    def __init__(self, config_path, series_keys=None):
         self.config = self._load_config(config_path)
         self.logger = get_logger("SCM-Data-Clean")
-        self.state_district_df = load_data(config[r'state_district'])
+        # Parsed lazily on first use and shared with every other DataCleaner in the process
+        cache_dir = os.path.join(resolve_path(self.config.get('storage_dir', 'Data\\Processed')), 'cache')
+        self.district_lookup = get_district_lookup(self.config[r'state_district'], cache_dir)
         self.engine = get_engine()
 
         self.product_patterns = {                            
@@ -49,13 +46,6 @@ class DataCleaner:
             "Gibber power": r".*gibber.*",
         }
 
-        self.month_mapping = {
-            "January": "Jan", "February": "Feb", "March": "March",
-            "April": "April", "May": "May", "June": "June",
-            "July": "July", "August": "Aug", "September": "Sep",
-            "October": "Oct", "November": "Nov", "December": "Dec"
-        }
-
         self.plant_state_mapping = {
         "CAP1": "Andhra Pradesh",
         "CCH1": "Chhattisgarh",
@@ -75,6 +65,15 @@ class DataCleaner:
         }
 
         self.required_col = ['Date','Product','QTY_MT','UOM','Season',"State",'FY','Month','Invoice_Value','Num_Month','Year']
+        self.excluded_mat_desc = ['Potassium Schoenite (Boost-1kg )','Potassium Schoenite(Potassium Schoenite)']
+        self.mahalaabh_products = ['Mahalaabh Gr.', 'Mahalaabh']
+        self.stage_columns = ['Billing_Date', 'Sold_To_Party_Name', 'Invoice_Value', 'Plant_Code', 'Inv_Qty']
+        self.memory_report = self.config.get('clean_memory_report', False)
+        # A series is one combination of these columns (State, Product and/or District)
+        self.series_keys = series_keys or self.config.get('series_keys', ['State'])
+        self.series_min_length = self.config.get('series_min_length', 12)
+        self.required_col += [key for key in self.series_keys if key not in self.required_col]
+        self.state_exports = {'Gujarat': 'data_GJ', 'Maharashtra': 'data_MH', 'Chhattisgarh': 'data_CG', 'Tamil Nadu': 'data_TN'}
 
 
     def _load_config(self, path):
@@ -92,38 +91,51 @@ class DataCleaner:
                 return product
         return None   
 
-    def _get_financial_year(self,date):               
-        if pd.isna(date):
-            return np.nan
-        year = date.year
-        month = date.month
-
-        if month < 4:                           # If Jan, Feb, Mar, it's part of pervious FY
-            fy_start = year - 1
-            fy_end = year
-        else:                                   # If Apr-Dec its part of current FY
-            fy_start = year
-            fy_end = year + 1
-
-        return f"{str(fy_start)[-2:]}-{str(fy_end)[-2:]}" 
-
+    def _classify_products(self, mat_desc):
+        """
+        Maps every distinct Mat_Desc value once with _map_product_name and
+        broadcasts the result back through the factorized codes, so the regex
+        cost scales with the number of unique descriptions, not invoice lines.
+        """
+        codes, uniques = pd.factorize(mat_desc)
+        products = np.array([self._map_product_name(desc) for desc in uniques] + [np.nan], dtype=object)
+        # NaN descriptions get code -1, which picks the trailing NaN slot
+        return pd.Series(products[codes], index=mat_desc.index, name='Product')
 
     def _clean_product_column(self, df):
+        """Returns the Product label for every row; excluded or unmatched descriptions are NaN."""
         self.logger.info("Mapping Product Column.......")
-        df_clean = df[~df['Mat_Desc'].isin(['Potassium Schoenite (Boost-1kg )','Potassium Schoenite(Potassium Schoenite)'])]        
-        
+        excluded = df['Mat_Desc'].isin(self.excluded_mat_desc)
+
         self.logger.info("Creating Clean Product Column.......")
-        df_clean['Product'] = df_clean['Mat_Desc'].apply(self._map_product_name)
+        product = self._classify_products(df['Mat_Desc']).mask(excluded)
         self.logger.info("Sucessfully Created Product Column.\n")
 
-        self.logger.info("Dropping NA value in Product Columns.......")
-        initial_count = df_clean.shape[0]
-        df_clean = df_clean.dropna(subset=["Product"])
-        final_count = df_clean.shape[0]
-        rows_removed = initial_count - final_count
-        self.logger.info(f"Number of rows removed: {rows_removed}\n")
+        self.logger.info(f"Number of rows without a product: {product.isna().sum()}\n")
+        return product
+
+    def _filtering_mahalaabh(self, df, product):
+        """
+        Keeps Mahalaabh rows with a valid Billing_Date and only the columns later stages use.
+        This is the single row-level copy of the extract; every later stage mutates it in place.
+        """
+        self.logger.info(f"Filtering Mahalaabh and Gr. from the data.....{df.shape}")
+        keep = product.isin(self.mahalaabh_products).to_numpy()
+
+        invalid_dates = keep & df['Billing_Date'].isna().to_numpy()
+        if invalid_dates.any():
+            self.logger.warning(f"{invalid_dates.sum()} invalid billing date row dropped due to conversion failure")
+            keep = keep & ~invalid_dates
+
+        # Project before taking rows, so only the stage columns are copied
+        df = df[[col for col in self.stage_columns if col in df.columns]].take(np.flatnonzero(keep))
+        df['Product'] = product.to_numpy()[keep]
+        self.logger.info(f"Number of rows after filtering:{df.shape}\n")
+
+        if df.empty:
+            self.logger.warning("No mahalaabh record found after filtering")
 
-        return df_clean
+        return df
 
     def _clean_date_features(self, df):
 
@@ -132,80 +144,50 @@ class DataCleaner:
         invalid_data = df['Billing_Date'].isna().sum()
         if invalid_data > 0:
             self.logger.warning(f"{invalid_data} invalid billing date row dropped due to conversion failure")
-            df = df.dropna(subset=['Billing_Date'])
-
-        self.logger.info("Creating Month Column......")    
-        df = df.copy()                                
-        df.loc[:,'Month'] = df['Billing_Date'].dt.strftime("%B").map(self.month_mapping)
-        self.logger.info("successfully Created Month Column.\n")
-
-                # Season Column
-        self.logger.info("Creating Season Column.......")
-        df = df.copy() 
-        df.loc[:,"Season"] = df["Month"].apply(
-            lambda x: "Kharif" if x in ["April", "May", "June", "July", "Aug", "Sep"] else "Rabi"
-        )
-        self.logger.info('Successfully Created Season column.\n')
-
-        self.logger.info("Creating FY Column..........")
-        df = df.copy() 
-        df.loc[:,'FY'] = df['Billing_Date'].apply(self._get_financial_year)
-        self.logger.info("Successfully Created FY Column\n")
-
-        # Month and Year Column
-        df['Num_Month'] = df['Billing_Date'].dt.month
-        df['Year'] = df['Billing_Date'].dt.year
+            df.dropna(subset=['Billing_Date'], inplace=True)
+
+        self.logger.info("Creating Month, Season and FY Columns......")
+        add_calendar_features(df, 'Billing_Date')
+        self.logger.info("Successfully Created Month, Season and FY Columns\n")
 
         # Billing Date to Date
-        df = df.rename(columns = {"Billing_Date":"Date"})
+        df.rename(columns = {"Billing_Date":"Date"}, inplace=True)
 
         return df
 
     def _plant_state_mapping(self,df):
 
         self.logger.info("Creating State Columns.......")
-        df = df.copy() 
-        df.loc[:,'State'] = df['Plant_Code'].map(self.plant_state_mapping)
+        df['State'] = df['Plant_Code'].map(self.plant_state_mapping)
         self.logger.info("Successfully Created State Columns\n")
 
         return df
     
     def _district_mapping(self,df):
         self.logger.info("Mapping Dealership to District Column....... ")
-        Dealership_to_district = self.state_district_df.set_index('Dealership Name')['District'].to_dict()
-        df = df.copy() 
-        df.loc[:,'District'] = df['Sold_To_Party_Name'].map(Dealership_to_district)
+        df['District'] = df['Sold_To_Party_Name'].map(self.district_lookup.mapping())
         self.logger.info(f"Number of rows where district is not found:{df['District'].isna().sum()}")
 
         return df
 
-    def _filtering_mahalaabh(self,df):
-
-        self.logger.info(f"Filtering Mahalaabh and Gr. from the data.....{df.shape}")
-        df = df[df['Product'].isin(['Mahalaabh Gr.', 'Mahalaabh'])].copy()
-        self.logger.info(f"Number of rows after filtering:{df.shape}\n")
-        
-        if df.empty:
-            self.logger.warning("No mahalaabh record found after filtering")
-
-        return df
-
-    
     def _clean_quantity(self,df):
         self.logger.info('Converting Kg to MT.....')
         df['UOM'] = 'MT'
-        df.loc[:, 'Inv_Qty'] = pd.to_numeric(df['Inv_Qty'], errors='coerce')
-        df.loc[:, 'QTY_MT'] = df['Inv_Qty'] / 1000
+        df['Inv_Qty'] = pd.to_numeric(df['Inv_Qty'], errors='coerce')
+        df['QTY_MT'] = df['Inv_Qty'] / 1000
         self.logger.info("Sucessfully Converted Kg to MT\n")
 
         return df
 
     def _monthly_aggregation(self,df):
         self.logger.info("Monthly Aggregation....")
-        df = df.copy()
         self.logger.info(f"data type of all columns:\n{df.dtypes}")
-        df.loc[:, 'Invoice_Value'] = pd.to_numeric(df['Invoice_Value'], errors='coerce')
-        df = df.groupby([pd.Grouper(key="Date", freq='MS'), "State"]).agg({  
+        df['Invoice_Value'] = pd.to_numeric(df['Invoice_Value'], errors='coerce')
+        if 'District' in self.series_keys:
+            # Keep dealers without a district so district totals still add up to the state
+            df['District'] = df['District'].fillna('Unmapped')
+        aggregations = {
+            'State': 'first',
             'Product': 'first',
             'Invoice_Value': 'sum',
             'QTY_MT': 'sum',
@@ -215,7 +197,10 @@ class DataCleaner:
             'Month': 'first',
             'Num_Month': 'first',
             'Year': 'first',
-        }).reset_index()
+        }
+        for key in self.series_keys:
+            aggregations.pop(key, None)
+        df = df.groupby([pd.Grouper(key="Date", freq='MS')] + self.series_keys).agg(aggregations).reset_index()
         
         self.logger.info("Monthly Aggregation Completed\n")
         return df
@@ -228,43 +213,70 @@ class DataCleaner:
         if missing_col:
             self.logger.error(f'Missing Columns(columns are not matching):{missing_col}\n')
         df = df[self.required_col]
-        
-        df_GJ = df[df['State'] == 'Gujarat'].copy()
-        df_MH = df[df['State'] == 'Maharashtra'].copy()
-        df_CG = df[df['State'] == 'Chhattisgarh'].copy()
-        df_TN = df[df['State'] == 'Tamil Nadu'].copy()
 
-        self.logger.info("Sucessfully Created MH,TN,CG,GJ varaible")
+        series_data = partition_series(df, self.series_keys, self.series_min_length)
+        self.logger.info(f"Sucessfully Created {len(series_data)} series")
         self.logger.info("---- Step Completed ----\n")
 
-        return df_GJ,df_MH,df_CG,df_TN,df
+        return series_data, df
+
+    def _saving_file(self, df):
+        self.logger.info("Saving clean data.......")
+        # Per-series reads go through load_dataset('data', config, filters=[('State', '==', ...)])
+        partition_cols = (['State'] if 'State' in self.series_keys else []) + ['FY']
+        path = save_dataset(df, 'data', self.config, partition_cols=partition_cols, csv_path=self.config[r"data"])
+        self.logger.info(f'Successfully saved clean data to {path}\n')
 
-    def _saving_file(self,df_GJ,df_MH,df_CG,df_TN,df):
-        self.logger.info("Creating CSV for data.......")
-        df_GJ.to_csv(self.config[r"data_GJ"], index=False)
-        df_MH.to_csv(self.config[r"data_MH"], index=False)
-        df_CG.to_csv(self.config[r"data_CG"], index=False)
-        df_TN.to_csv(self.config[r"data_TN"], index=False)
-        df.to_csv(self.config[r"data"], index=False)
-        self.logger.info('Successfully created CSV files.\n')
+        if self.config.get('storage_export_csv', True):
+            self.logger.info("Creating CSV for state data.......")
+            for state, state_df in df.groupby('State'):
+                if self.state_exports.get(state) in self.config:
+                    state_df.to_csv(resolve_path(self.config[self.state_exports[state]]), index=False)
+            self.logger.info('Successfully created CSV files.\n')
 
         self.logger.info("Clean data -> clean table")
         df.to_sql(name = self.config[r"clean_data_path"], con = self.engine, if_exists = 'replace', index = False)
 
-    def process_all(self,raw_data):
-
-        df = raw_data.copy()
-        df = self._clean_product_column(df)
-        df = self._clean_date_features(df)
-        df = self._plant_state_mapping(df)
-        df = self._district_mapping(df)
-        df = self._filtering_mahalaabh(df)
-        df = self._clean_quantity(df)
-        df = self._monthly_aggregation(df)
-        df_GJ,df_MH,df_CG,df_TN,df = self._column_formatting(df)
-        self._saving_file(df_GJ,df_MH,df_CG,df_TN,df)
+    def _run_stage(self, name, stage, *args):
+        """Runs one cleaning stage; with clean_memory_report on, logs its peak traced memory."""
+        if not self.memory_report:
+            return stage(*args)
+
+        tracemalloc.reset_peak()
+        result = stage(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        frame_size = result.memory_usage(deep=True).sum() if isinstance(result, pd.DataFrame) else result.memory_usage(deep=True)
+        self.logger.info(f"[Memory] {name}: peak {peak / 2**20:.1f} MB, output {frame_size / 2**20:.1f} MB")
+        return result
+
+    def process_all(self, raw_data, save=True):
+        """
+        Cleans raw_data into monthly series. With save=False nothing is written: the shared
+        'data' dataset, state CSVs and clean table only ever hold the configured series_keys.
+        """
+
+        if self.memory_report:
+            tracemalloc.start()
+            self.logger.info(f"[Memory] raw_data: {raw_data.memory_usage(deep=True).sum() / 2**20:.1f} MB")
+        try:
+            # raw_data is never modified; the filtered frame below is the only working copy
+            product = self._run_stage('product', self._clean_product_column, raw_data)
+            df = self._run_stage('filter', self._filtering_mahalaabh, raw_data, product)
+            del product
+            df = self._run_stage('dates', self._clean_date_features, df)
+            df = self._run_stage('state', self._plant_state_mapping, df)
+            df = self._run_stage('district', self._district_mapping, df)
+            df = self._run_stage('quantity', self._clean_quantity, df)
+            df = self._run_stage('monthly', self._monthly_aggregation, df)
+        finally:
+            if self.memory_report:
+                tracemalloc.stop()
+
+        series_data, df = self._column_formatting(df)
+        if save:
+            self._saving_file(df)
         
-        return df_GJ,df_MH,df_CG,df_TN,df
+        return series_data, df
 
 
 
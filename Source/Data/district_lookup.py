@@ -0,0 +1,83 @@
+import pandas as pd 
+import os
+import sys
+import json
+import hashlib
+from functools import lru_cache
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Source.Utils.helpers import load_data
+from Source.Utils.storage import resolve_path
+from Logging.logger import get_logger
+
+
+class DistrictLookup:
+    """
+    Dealership Name -> District lookup built from the dealer report workbook.
+
+    The mapping is loaded on first use and cached in memory and on disk (Parquet). Every
+    lookup stats the workbook and only reloads when its mtime or size changed; a changed
+    mtime alone triggers a hash check, and the workbook is re-parsed only when its content changed.
+    """
+
+    def __init__(self, source_path, cache_dir):
+        self.source_path = resolve_path(source_path)
+        self.cache_path = os.path.join(resolve_path(cache_dir), 'dealer_district.parquet')
+        self.meta_path = os.path.join(resolve_path(cache_dir), 'dealer_district.meta.json')
+        self.logger = get_logger("SCM-Data-Clean")
+        self._mapping = None
+        self._stamp = None
+
+    def _source_hash(self):
+        digest = hashlib.sha256()
+        with open(self.source_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load_cache(self, stat):
+        """Returns the cached mapping if it still matches the source workbook, else None."""
+        if not (os.path.exists(self.cache_path) and os.path.exists(self.meta_path)):
+            return None
+        with open(self.meta_path, "r") as f:
+            meta = json.load(f)
+
+        if meta['mtime'] != stat.st_mtime or meta['size'] != stat.st_size:
+            if meta['size'] != stat.st_size or meta['sha256'] != self._source_hash():
+                return None
+            # Touched but unchanged: remember the new mtime and keep the cache
+            self._write_meta(stat, meta['sha256'])
+
+        cached = pd.read_parquet(self.cache_path)
+        return cached.set_index('Dealership Name')['District']
+
+    def _write_meta(self, stat, sha256):
+        with open(self.meta_path, "w") as f:
+            json.dump({'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': sha256}, f, indent=4)
+
+    def _build(self, stat):
+        self.logger.info(f"Building dealer to district lookup from {self.source_path}......")
+        dealers = load_data(self.source_path)[['Dealership Name', 'District']]
+        # Same as the old set_index(...).to_dict(): the last row wins for repeated dealers
+        dealers = dealers.drop_duplicates('Dealership Name', keep='last')
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        dealers.to_parquet(self.cache_path, index=False)
+        self._write_meta(stat, self._source_hash())
+        return dealers.set_index('Dealership Name')['District']
+
+    def mapping(self):
+        """Returns the lookup as a Series indexed by Dealership Name, for Series.map."""
+        stat = os.stat(self.source_path)
+        stamp = (stat.st_mtime, stat.st_size)
+        if self._mapping is None or self._stamp != stamp:
+            mapping = self._load_cache(stat)
+            self._mapping = mapping if mapping is not None else self._build(stat)
+            self._stamp = stamp
+        return self._mapping
+
+
+@lru_cache(maxsize=None)
+def get_district_lookup(source_path, cache_dir):
+    """Process-wide DistrictLookup per workbook, so every caller shares one parse (refreshed when the workbook changes)."""
+    return DistrictLookup(source_path, cache_dir)
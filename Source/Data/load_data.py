@@ -1,20 +1,19 @@
 import pandas as pd 
 import numpy as np 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re
 import sys
 import os
 import json
-from datetime import datetime
 
 # Adjust path to import custom modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from Logging.logger import get_logger
 from Source.Database.db_con import get_engine
+from Source.Utils.storage import save_dataset, load_dataset, dataset_path
+from sqlalchemy import DateTime, column, literal, select, table
 
 # ----------------------------Configuration of files--------------------------------------
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+WATERMARK_PATH = os.path.join(PROJECT_ROOT, 'Data', 'Processed', 'raw_data_watermark.json')
 
 class DataLoader:
     def __init__(self, config_path):
@@ -25,74 +24,182 @@ class DataLoader:
             'Billing_Date', 'Sold_To_Party_Name', 'Invoice_Value', 'Plant_Code',
             'Mat_Desc', 'Inv_Qty', 'Inv_Qty_UOM'
         ]
+        # Stamped on every row by the ingestion scripts (Source/Database)
+        self.watermark_columns = ['imported_at', 'source_file_name']
+        self.incremental = self.config.get('incremental_load', False)
+        self.chunksize = self.config.get('load_chunksize', 50000)
+        self.start_date = self.config.get('load_start_date')
+        self.end_date = self.config.get('load_end_date')
 
     def _load_config(self, path):
         with open(path, "r") as f:
             return json.load(f)
 
-    def _fetch_data(self):
+    def _build_query(self, since=None):
+        """
+        Builds the projected SELECT on raw_data. Only the columns the pipeline uses are
+        read, and the watermark is applied in the database. Billing_Date is dd-mm-yyyy
+        text there, so the date range is applied after parsing (_apply_date_range).
+        """
+        columns = self.required_columns + (self.watermark_columns if self.incremental else [])
+        raw_data = table('raw_data', *[column(name) for name in columns])
+        query = select(*raw_data.c)
+        if since is not None:
+            query = query.where(raw_data.c.imported_at >= literal(since.to_pydatetime(), DateTime))
+        return query
+
+    def _stream_chunks(self, query, watermark=None):
+        """
+        Reads the query through a server-side cursor in chunks of `load_chunksize` rows,
+        validating and parsing dates per chunk so peak memory follows the chunk size.
+        With a watermark, rows stamped at its timestamp from files already loaded are skipped.
+        """
+        chunks = []
+        initial_count, dropped = 0, 0
+        with self.engine.connect().execution_options(stream_results=True) as conn:
+            for chunk in pd.read_sql(query, con=conn, chunksize=self.chunksize):
+                if watermark is not None:
+                    already_loaded = (pd.to_datetime(chunk['imported_at']) == pd.Timestamp(watermark['imported_at'])) & \
+                        chunk['source_file_name'].isin(watermark['source_files'])
+                    chunk = chunk[~already_loaded]
+                chunk = self._validate_and_filter_columns(chunk)
+                chunk_rows = chunk.shape[0]
+                chunk = self._process_dates(chunk)
+                initial_count += chunk_rows
+                dropped += chunk_rows - chunk.shape[0]
+                chunks.append(chunk)
+
+        self.logger.info(f"Number of rows in data: {initial_count} ({len(chunks)} chunks)")
+        self.logger.info(f"Number of rows dropped due to invalid dates: {dropped}\n")
+        if not chunks:
+            columns = self.required_columns + (self.watermark_columns if self.incremental else [])
+            return pd.DataFrame(columns=columns)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _fetch_data(self, full_refresh=False):
         """Fetches raw data from the database."""
+        if self.incremental and not full_refresh:
+            return self._fetch_incremental()
+
         self.logger.info("Loading Data from database ...........")
         try:
             # Using the centralized engine from db_con
-            df = pd.read_sql("SELECT * FROM raw_data", con=self.engine)
+            df = self._stream_chunks(self._build_query())
             self.logger.info("raw_data loaded from database\n")
             self.logger.info(f"Head of raw_data:\n{df.head()}")
+            if self.incremental:
+                self._save_snapshot(df)
             return df
         except Exception as e:
             self.logger.error(f"Error fetching data from database: {e}", exc_info=True)
             raise
 
+    def _fetch_incremental(self):
+        """
+        Fetches only rows imported at or after the stored watermark and merges them
+        with the local snapshot of earlier loads. Files already in the snapshot at the
+        watermark timestamp are skipped, so a batch sharing that timestamp is not lost.
+        """
+        snapshot, watermark = self._load_snapshot()
+        if snapshot is None:
+            self.logger.info("No usable raw_data snapshot found, running a full load.")
+            return self._fetch_data(full_refresh=True)
+
+        watermark_ts = pd.Timestamp(watermark['imported_at'])
+        self.logger.info(f"Loading raw_data imported since {watermark_ts} ...........")
+        try:
+            new_rows = self._stream_chunks(self._build_query(since=watermark_ts), watermark)
+        except Exception as e:
+            self.logger.error(f"Error fetching incremental data from database: {e}", exc_info=True)
+            raise
+        self.logger.info(f"{new_rows.shape[0]} new rows from {new_rows['source_file_name'].nunique()} files\n")
+
+        if new_rows.empty:
+            return snapshot
+
+        df = pd.concat([snapshot, new_rows[snapshot.columns]], ignore_index=True)
+        self._save_snapshot(df)
+        return df
+
+    def _load_snapshot(self):
+        """Returns the cached raw_data snapshot and its watermark, or (None, None)."""
+        if not (os.path.exists(dataset_path('raw_data_snapshot', self.config)) and os.path.exists(WATERMARK_PATH)):
+            return None, None
+        with open(WATERMARK_PATH, "r") as f:
+            watermark = json.load(f)
+        # Older snapshots were saved after the date range filter and cannot serve another range
+        if not watermark.get('unfiltered'):
+            return None, None
+        return load_dataset('raw_data_snapshot', self.config), watermark
+
+    def _save_snapshot(self, df):
+        """Caches the fetched rows (before the date range) and records the newest imported_at with its source files."""
+        missing = [col for col in self.watermark_columns if col not in df.columns]
+        if missing or df.empty:
+            self.logger.warning(f"Cannot keep a watermark, raw_data has no {missing or 'rows'}.")
+            return
+
+        imported_at = pd.to_datetime(df['imported_at'])
+        latest = imported_at.max()
+        watermark = {
+            'imported_at': latest.isoformat(),
+            'source_files': sorted(df.loc[imported_at == latest, 'source_file_name'].unique().tolist()),
+            'unfiltered': True,
+        }
+
+        save_dataset(df, 'raw_data_snapshot', self.config)
+        with open(WATERMARK_PATH, "w") as f:
+            json.dump(watermark, f, indent=4)
+        self.logger.info(f"raw_data snapshot saved, watermark {watermark['imported_at']}\n")
+
     def _validate_and_filter_columns(self, df):
-        """Selects required columns and checks for missing ones."""
-        self.logger.info("Validating and selecting required columns...")
+        """Selects required (and, in incremental mode, watermark) columns and checks for missing ones."""
         missing = [col for col in self.required_columns if col not in df.columns]
         if missing:
             self.logger.warning(f"Missing columns in the dataset: {missing}")
             raise ValueError(f'Missing required columns: {missing}')
-        
-        df_selected = df[self.required_columns].copy()
-        self.logger.info("Columns validated and selected.\n")
-        return df_selected
+
+        columns = self.required_columns + [col for col in self.watermark_columns if self.incremental and col in df.columns]
+        return df[columns].copy()
 
     def _process_dates(self, df):
-        """Converts Billing_Date to datetime and handles errors."""
-        self.logger.info("Processing date format...")
-        initial_count = df.shape[0]
-        
-        df = df.copy()
+        """Converts Billing_Date to datetime and drops invalid dates."""
         df['Billing_Date'] = pd.to_datetime(df['Billing_Date'], errors='coerce', dayfirst=True)
-        
-        df_clean = df.dropna(subset=['Billing_Date'])
-        final_count = df_clean.shape[0]
-        
-        self.logger.info(f'Number of rows in data: {initial_count}')
-        self.logger.info(f'Number of rows dropped due to invalid dates: {initial_count - final_count}\n')
-        
-        return df_clean
+        return df[df['Billing_Date'].notna()]
+
+    def _apply_date_range(self, df):
+        """Keeps rows inside the configured load_start_date / load_end_date (inclusive)."""
+        if not (self.start_date or self.end_date):
+            return df
+        valid = pd.Series(True, index=df.index)
+        if self.start_date:
+            valid &= df['Billing_Date'] >= pd.Timestamp(self.start_date)
+        if self.end_date:
+            valid &= df['Billing_Date'] <= pd.Timestamp(self.end_date)
+        self.logger.info(f"Number of rows outside the date range: {(~valid).sum()}\n")
+        return df[valid]
 
     def _save_data(self, df):
-        """Saves the processed dataframe to CSV."""
-        output_path = os.path.join(PROJECT_ROOT, 'Data', 'Processed', 'data_load_raw_data.csv')
+        """Saves the processed dataframe with the configured storage backend (CSV export optional)."""
+        csv_path = os.path.join(PROJECT_ROOT, 'Data', 'Processed', 'data_load_raw_data.csv')
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            df.to_csv(output_path, index=False)
+            output_path = save_dataset(df, 'data_load_raw_data', self.config, csv_path=csv_path)
             self.logger.info(f"Data saved successfully to {output_path}\n")
         except Exception as e:
-            self.logger.error(f"Error saving data to CSV: {e}", exc_info=True)
+            self.logger.error(f"Error saving data: {e}", exc_info=True)
             raise
 
-    def load_raw_data(self):
+    def load_raw_data(self, full_refresh=False):
         """
         Orchestrates the loading, cleaning, and saving of raw data.
+        Args:
+            full_refresh (bool): Ignore the incremental snapshot and re-read the whole table.
         Returns:
             pandas.DataFrame: The processed dataframe.
         """
         try:
-            df = self._fetch_data()
-            df = self._validate_and_filter_columns(df)
-            df = self._process_dates(df)
+            df = self._fetch_data(full_refresh)
+            df = self._apply_date_range(df[self.required_columns])
             
             self.logger.info(f"Load Data Set Completed. Final shape: {df.shape}\n")
             
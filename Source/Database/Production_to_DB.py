@@ -10,14 +10,11 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..
 from Source.Database.db_con import get_engine
 
 folder_incoming = r"E:\Supply-Chain_management(SCM)\Data\Raw\Production"
-db_user = r'root'
-db_host = r'localhost'
-db_name = r'scm'
 table_name = r'production_data'
 
 
-# Connect to database
-engine = create_engine(f'mysql+pymysql://{db_user}@{db_host}/{db_name}')
+# Connect to database (shared engine, settings from config.json)
+engine = get_engine()
 
 files = [f for f in os.listdir(folder_incoming) if f.endswith(('.xlsx', '.xls',".XLSX",'.csv','.CSV'))]
 
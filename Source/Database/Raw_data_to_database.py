@@ -1,60 +1,31 @@
 import os 
 import sys
-import pandas as pd 
-from sqlalchemy import create_engine
-from datetime import datetime
-import shutil
+import json
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Source.Database.ingestion import IngestionManager
+from Source.Database.db_con import get_engine
 
 #CONFIGURATION
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 folder_incoming = os.path.join(BASE_DIR, 'Data', 'Raw', 'Incoming')
 folder_preocessed = os.path.join(BASE_DIR, 'Data', 'Processed')
-db_user = r'root'
-db_host = r'localhost'
-db_name = r'scm'
+folder_duplicate = os.path.join(BASE_DIR, 'Data', 'Raw', 'Duplicate')
 table_name = r'raw_data'
 
+with open(os.path.join(BASE_DIR, 'Source', 'config.json'), "r") as f:
+    config = json.load(f)
+ingest_chunksize = config.get('ingest_chunksize', 5000)
+ingest_method = config.get('ingest_method', 'multi')
+ingest_workers = config.get('ingest_workers', 4)
 
-# Connect to database
-engine = create_engine(f'mysql+pymysql://{db_user}@{db_host}/{db_name}')
 
-# Scan for Excel File 
-files = [f for f in os.listdir(folder_incoming) if f.endswith(('.xlsx', '.xls',".XLSX"))]
+if __name__ == "__main__":
+    # Connect to database (LOAD DATA LOCAL INFILE has to be allowed by the client)
+    connect_args = {'local_infile': True} if ingest_method == 'infile' else {}
+    engine = get_engine(connect_args=connect_args)
 
-for file in files:
-    file_path = os.path.join(folder_incoming, file)
-
-
-    required_columns = [
-        'Billing Date', 'Sold-To-Party Name', 'Invoice Value', 'Plant Code',
-        'Mat. Desc.','Inv Qty.','Inv Qty UOM.']
-    
-    try:
-        df = pd.read_excel(file_path, sheet_name='Sheet1', usecols = required_columns)
-    except Exception as e:
-        print(f"Error reading {file}: {e}")
-        continue
-
-
-
-    df.columns = (
-    df.columns.str.strip()  # remove leading/trailing spaces
-              .str.replace(r'[^0-9a-zA-Z]+', '_', regex=True) 
-              .str.replace(r'_+$', '', regex=True) # replace bad chars with _
-    )
-    df['imported_at'] = datetime.now()
-    df['source_file_name'] = file
-
-
-    # DUMP to DATABASE
-
-    try:
-        df.head(0).to_sql(name=table_name , con=engine, if_exists='append', index=False)   
-        df.to_sql(name=table_name, con=engine, if_exists='append', index=False)
-        print(f"IMported {file} successfully")
-    except Exception as e:
-        print(f"Error importing {file}: {e}")
-        continue
-
-    # Move File to Processed
-    shutil.move(file_path, os.path.join(folder_preocessed, file))
\ No newline at end of file
+    # Parse workbooks in parallel, move imported files to Processed and already-ingested content to Duplicate
+    manager = IngestionManager(engine, folder_incoming, folder_preocessed, table_name,
+                               max_workers=ingest_workers, chunksize=ingest_chunksize, method=ingest_method,
+                               folder_duplicate=folder_duplicate)
+    manager.run()
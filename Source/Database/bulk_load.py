@@ -0,0 +1,84 @@
+import pandas as pd 
+import os
+import tempfile
+from sqlalchemy import text, inspect
+from sqlalchemy.engine import Connection
+
+"BULK INSERT HELPERS FOR THE INGESTION SCRIPTS"
+
+
+def bulk_insert(df, table_name, engine, chunksize=5000, method='multi'):
+    """
+    Appends a dataframe to a table in a single transaction.
+
+    Parameters:
+    df (pd.DataFrame): Rows to insert.
+    table_name (str): Target table, created on first use.
+    engine (sqlalchemy.Engine | sqlalchemy.Connection): Database engine, or a connection
+        whose open transaction the insert should join.
+    chunksize (int): Rows per multi-row INSERT statement.
+    method (str): 'multi' for batched multi-row INSERTs, 'infile' to stage a CSV and use
+        MySQL's LOAD DATA LOCAL INFILE (needs local_infile enabled on client and server).
+        With 'infile' the table must exist before the transaction: given an engine, it is
+        created first by create_table (not rolled back if the load fails); given a
+        connection, the caller has to call create_table beforehand.
+
+    Returns:
+    int: Number of rows inserted.
+    """
+    if method not in ('multi', 'infile'):
+        raise ValueError(f"Unsupported bulk insert method: {method}")
+    if method == 'infile' and engine.dialect.name != 'mysql':
+        raise ValueError(f"LOAD DATA INFILE is only available on MySQL, not {engine.dialect.name}")
+
+    if isinstance(engine, Connection):
+        _insert(df, table_name, engine, chunksize, method)
+    else:
+        if method == 'infile':
+            create_table(df, table_name, engine)
+        with engine.begin() as conn:
+            _insert(df, table_name, conn, chunksize, method)
+    return len(df)
+
+
+def _insert(df, table_name, conn, chunksize, method):
+    if method == 'multi':
+        if conn.dialect.name == 'sqlite':
+            # SQLite caps bound parameters per statement at 32766
+            chunksize = min(chunksize, max(1, 32766 // max(1, len(df.columns))))
+        df.to_sql(name=table_name, con=conn, if_exists='append', index=False,
+                  chunksize=chunksize, method='multi')
+    else:
+        _load_data_infile(df, table_name, conn)
+
+
+def create_table(df, table_name, engine):
+    """
+    Creates `table_name` with the frame's schema if it does not exist yet, in its own
+    transaction. On MySQL DDL commits implicitly, so this step cannot be rolled back:
+    a load that fails afterwards leaves the (empty) table in place.
+    """
+    with engine.begin() as conn:
+        df.head(0).to_sql(name=table_name, con=conn, if_exists='append', index=False)
+
+
+def _load_data_infile(df, table_name, conn):
+    """Stages the frame as CSV and loads it with the MySQL native bulk loader."""
+    # Creating it here would implicitly commit the caller's open transaction
+    if not inspect(conn).has_table(table_name):
+        raise ValueError(f"Table {table_name} does not exist; create it with create_table before the transaction")
+
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        # With ESCAPED BY '' MySQL reads an unquoted NULL (not \N) as NULL; backslashes in values stay literal.
+        # An explicit lineterminator keeps LF on Windows, matching LINES TERMINATED BY.
+        df.to_csv(path, index=False, header=False, na_rep='NULL', date_format='%Y-%m-%d %H:%M:%S', lineterminator='\n')
+        columns = ', '.join(f'`{col}`' for col in df.columns)
+        conn.execute(text(
+            f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' INTO TABLE `{table_name}` "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '\\n' ({columns})"
+        ))
+    finally:
+        os.remove(path)
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
 import json
 import os
 
@@ -10,6 +11,67 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 with open(os.path.join(BASE_DIR, '..', 'config.json'), "r") as f:
     config = json.load(f)
 
-def get_engine():
-    return create_engine(f"mysql+pymysql://{config['username']}@{config['host']}/{config['database']}")
+# One engine (and connection pool) per URL per process
+_engines = {}
 
+# Backends without a server connection pool to size (local stand-ins for MySQL)
+EMBEDDED_BACKENDS = ('sqlite', 'duckdb')
+
+
+def get_database_url():
+    """db_url from config (e.g. sqlite:///scm.db or duckdb:///scm.duckdb), else the MySQL settings."""
+    if config.get('db_url'):
+        return config['db_url']
+    return URL.create(
+        'mysql+pymysql',
+        username=config['username'],
+        password=config.get('password') or None,
+        host=config['host'],
+        database=config['database'],
+    ).render_as_string(hide_password=False)
+
+
+def get_engine(url=None, **engine_kwargs):
+    """
+    Returns the process-wide engine for `url` (default: get_database_url()), creating it once.
+
+    Pool sizing, pre-ping and recycle come from config.json; extra keyword arguments
+    (e.g. connect_args) are passed to create_engine and become part of the registry key.
+    """
+    url = url or get_database_url()
+    key = (url, repr(sorted(engine_kwargs.items())))
+    if key not in _engines:
+        options = {
+            'pool_pre_ping': config.get('db_pool_pre_ping', True),
+            'pool_recycle': config.get('db_pool_recycle', 3600),
+        }
+        if make_url(url).get_backend_name() not in EMBEDDED_BACKENDS:
+            options['pool_size'] = config.get('db_pool_size', 5)
+            options['max_overflow'] = config.get('db_max_overflow', 10)
+        options.update(engine_kwargs)
+        _engines[key] = create_engine(url, **options)
+    return _engines[key]
+
+
+def get_sqlite_engine(path):
+    """Engine for an embedded SQLite file at `path`, creating its folder."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return get_engine(f"sqlite:///{path}")
+
+
+def dispose_engines():
+    """Closes every pooled connection held by this process."""
+    for engine in _engines.values():
+        engine.dispose()
+    _engines.clear()
+
+
+def _reset_pools_after_fork():
+    # A forked child must not reuse the parent's sockets: give each engine a fresh pool
+    # without closing the connections the parent is still using.
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
@@ -0,0 +1,187 @@
+import pandas as pd 
+import os
+import sys
+import time
+import shutil
+import hashlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import MetaData, Table, Column, String, Integer, BigInteger, Float, DateTime, select
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Logging.logger import get_logger
+from Source.Database.bulk_load import bulk_insert, create_table
+
+"INGESTION MANAGER FOR INCOMING SALES WORKBOOKS"
+
+REQUIRED_COLUMNS = [
+    'Billing Date', 'Sold-To-Party Name', 'Invoice Value', 'Plant Code',
+    'Mat. Desc.', 'Inv Qty.', 'Inv Qty UOM.'
+]
+
+metadata = MetaData()
+ingest_manifest = Table(
+    'ingest_manifest', metadata,
+    Column('file_hash', String(64), primary_key=True),
+    Column('file_name', String(255), nullable=False),
+    Column('table_name', String(64), nullable=False),
+    Column('row_count', Integer),
+    Column('file_bytes', BigInteger),
+    Column('parse_seconds', Float),
+    Column('imported_at', DateTime),
+)
+
+
+def file_hash(file_path, block_size=1 << 20):
+    """SHA-256 of the file contents, so a renamed copy hashes the same."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_workbook(file_path):
+    """Parses one workbook into the raw_data layout. Runs in a worker process; imported_at is stamped at commit."""
+    start = time.perf_counter()
+    df = pd.read_excel(file_path, sheet_name='Sheet1', usecols=REQUIRED_COLUMNS)
+    df.columns = (
+        df.columns.str.strip()  # remove leading/trailing spaces
+                  .str.replace(r'[^0-9a-zA-Z]+', '_', regex=True) 
+                  .str.replace(r'_+$', '', regex=True) # replace bad chars with _
+    )
+    df['source_file_name'] = os.path.basename(file_path)
+    return df, time.perf_counter() - start
+
+
+class IngestionManager:
+    def __init__(self, engine, folder_incoming, folder_processed, table_name='raw_data',
+                 max_workers=4, chunksize=5000, method='multi', folder_duplicate=None):
+        self.engine = engine
+        self.folder_incoming = folder_incoming
+        self.folder_processed = folder_processed
+        self.folder_duplicate = folder_duplicate or os.path.join(os.path.dirname(folder_incoming), 'Duplicate')
+        self.table_name = table_name
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.method = method
+        self.logger = get_logger("Raw-Data-Ingestion")
+        metadata.create_all(self.engine, tables=[ingest_manifest])
+
+    def _scan(self):
+        return sorted(f for f in os.listdir(self.folder_incoming) if f.endswith(('.xlsx', '.xls', ".XLSX")))
+
+    def _ingested_hashes(self):
+        with self.engine.connect() as conn:
+            return set(conn.execute(select(ingest_manifest.c.file_hash)).scalars())
+
+    def _move_duplicate(self, file, digest):
+        """Moves a duplicate out of the incoming folder, so it is not re-hashed and re-reported every run."""
+        os.makedirs(self.folder_duplicate, exist_ok=True)
+        target = os.path.join(self.folder_duplicate, file)
+        if os.path.exists(target):
+            target = os.path.join(self.folder_duplicate, f"{digest[:12]}_{file}")
+        shutil.move(os.path.join(self.folder_incoming, file), target)
+
+    def _select_new_files(self, files):
+        """
+        Hashes every file and keeps those whose content is neither ingested nor repeated in
+        this batch. Copies of ingested content are moved to the duplicate folder right away;
+        copies of another file in this batch are returned as {file: (digest, original)} and
+        only moved once the original has been committed (see _move_batch_duplicates).
+        """
+        ingested = self._ingested_hashes()
+        new_files, batch_duplicates, batch = {}, {}, {}
+        for file in files:
+            digest = file_hash(os.path.join(self.folder_incoming, file))
+            if digest in ingested:
+                self.logger.warning(f"Skipping {file}: same content already ingested ({digest[:12]}), "
+                                    f"moved to {self.folder_duplicate}")
+                self._move_duplicate(file, digest)
+            elif digest in batch:
+                self.logger.warning(f"Skipping {file}: same content as {batch[digest]} ({digest[:12]})")
+                batch_duplicates[file] = (digest, batch[digest])
+            else:
+                batch[digest] = file
+                new_files[file] = digest
+        return new_files, batch_duplicates
+
+    def _move_batch_duplicates(self, batch_duplicates, imported):
+        """Moves in-batch copies whose original committed; the others stay in the incoming folder for the next run."""
+        statuses = {}
+        for file, (digest, original) in batch_duplicates.items():
+            if original in imported:
+                self._move_duplicate(file, digest)
+                statuses[file] = 'duplicate'
+            else:
+                self.logger.warning(f"Keeping {file} in {self.folder_incoming}: {original} was not imported")
+                statuses[file] = f'duplicate of {original} (kept, original not imported)'
+        return statuses
+
+    def _store(self, file, digest, df, parse_seconds):
+        """
+        Inserts the rows and the manifest entry in one transaction, then moves the file.
+        imported_at is stamped here rather than at parse time: files finish parsing out of
+        order, and commits run one at a time, so stamps follow commit order and a concurrent
+        incremental load cannot move its watermark past rows that are not committed yet.
+        """
+        file_path = os.path.join(self.folder_incoming, file)
+        file_bytes = os.path.getsize(file_path)
+        imported_at = datetime.now()
+        df['imported_at'] = imported_at
+        if self.method == 'infile':
+            # Outside the transaction: MySQL commits DDL implicitly
+            create_table(df, self.table_name, self.engine)
+        with self.engine.begin() as conn:
+            bulk_insert(df, self.table_name, conn, chunksize=self.chunksize, method=self.method)
+            conn.execute(ingest_manifest.insert(), {
+                'file_hash': digest,
+                'file_name': file,
+                'table_name': self.table_name,
+                'row_count': len(df),
+                'file_bytes': file_bytes,
+                'parse_seconds': parse_seconds,
+                'imported_at': imported_at,
+            })
+        os.makedirs(self.folder_processed, exist_ok=True)
+        shutil.move(file_path, os.path.join(self.folder_processed, file))
+        return {'file': file, 'status': 'imported', 'rows': len(df),
+                'bytes': file_bytes, 'parse_seconds': round(parse_seconds, 2)}
+
+    def run(self):
+        """
+        Ingests every new workbook in the incoming folder.
+        Returns:
+            pandas.DataFrame: One row per file with status, rows, bytes and parse time.
+        """
+        files = self._scan()
+        self.logger.info(f"Found {len(files)} workbooks in {self.folder_incoming}")
+        new_files, batch_duplicates = self._select_new_files(files)
+        report = [{'file': file, 'status': 'duplicate'} for file in files
+                  if file not in new_files and file not in batch_duplicates]
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(parse_workbook, os.path.join(self.folder_incoming, file)): file
+                for file in new_files
+            }
+            for future in as_completed(futures):
+                file = futures[future]
+                try:
+                    df, parse_seconds = future.result()
+                    result = self._store(file, new_files[file], df, parse_seconds)
+                    self.logger.info(f"Imported {file}: {result['rows']} rows, {result['bytes']} bytes, "
+                                     f"parsed in {result['parse_seconds']}s")
+                except Exception as e:
+                    self.logger.error(f"Error importing {file}: {e}", exc_info=True)
+                    result = {'file': file, 'status': f'failed: {e}'}
+                report.append(result)
+
+        # Only now: moving a copy before its original committed could lose the content on a failed import
+        imported = {result['file'] for result in report if result['status'] == 'imported'}
+        statuses = self._move_batch_duplicates(batch_duplicates, imported)
+        report += [{'file': file, 'status': status} for file, status in statuses.items()]
+
+        report = pd.DataFrame(report, columns=['file', 'status', 'rows', 'bytes', 'parse_seconds'])
+        self.logger.info(f"Ingestion summary:\n{report.to_string(index=False)}\n")
+        return report
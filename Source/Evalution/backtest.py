@@ -0,0 +1,151 @@
+import pandas as pd 
+import numpy as np 
+import sys
+import os
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import MetaData, Table, Column, Index, String, Integer, Float, DateTime, select, func
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..')))
+from Logging.logger import get_logger
+from Source.Database.bulk_load import bulk_insert
+from Source.Utils.helpers import rolling_origin_splits
+from Source.Models.train_prophet import default_prophet_params, fit_prophet
+from Source.Evalution.metrics_store import get_metrics_engine
+
+
+metadata = MetaData()
+backtest_metrics = Table(
+    'backtest_metrics', metadata,
+    Column('series', String(128), nullable=False),
+    Column('model', String(64), nullable=False),
+    Column('run_id', String(32), nullable=False),
+    Column('cutoff', DateTime, nullable=False),
+    Column('horizon', Integer, nullable=False),
+    Column('ds', DateTime, nullable=False),
+    Column('y', Float),
+    Column('yhat', Float),
+    Column('yhat_lower', Float),
+    Column('yhat_upper', Float),
+    Column('abs_error', Float),
+    Column('squared_error', Float),
+    Column('ape', Float),
+    Index('ix_backtest_series_run', 'series', 'run_id', 'cutoff', 'horizon'),
+)
+
+
+def backtest_fold(series, prophet_data, params, train_end, horizon):
+    """
+    Refits on rows [0, train_end) and forecasts the next `horizon` rows. Runs in a worker process.
+    The fit is the production one (fit_prophet), so the errors describe the model that ships.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    model = fit_prophet(prophet_data.iloc[:train_end], params)
+    test = prophet_data.iloc[train_end:train_end + horizon]
+    forecast = model.predict(test[['ds']])
+    return pd.DataFrame({
+        'series': series,
+        'cutoff': prophet_data['ds'].iloc[train_end - 1],
+        'horizon': np.arange(1, len(test) + 1),
+        'ds': test['ds'].to_numpy(),
+        'y': test['y'].to_numpy(),
+        'yhat': forecast['yhat'].to_numpy(),
+        'yhat_lower': forecast['yhat_lower'].to_numpy(),
+        'yhat_upper': forecast['yhat_upper'].to_numpy(),
+    })
+
+
+class Backtester:
+    """
+    Out-of-sample accuracy through expanding-window refits.
+
+    Every (series, cutoff) fit is an independent job in one process pool, and the
+    errors per cutoff and horizon step go to the backtest_metrics table.
+    """
+
+    def __init__(self, config_path, model='Prophet'):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("Backtest-Logger")
+        self.model = model
+        self.initial = self.config.get('backtest_initial', 36)
+        self.period = self.config.get('backtest_period', 1)
+        self.horizon = self.config.get('forecast_horizon', 3)
+        self.max_workers = self.config.get('parallel_workers', 1)
+        self.engine = get_metrics_engine(self.config)
+        metadata.create_all(self.engine, tables=[backtest_metrics])
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _score(self, predictions, run_id):
+        predictions['model'] = self.model
+        predictions['run_id'] = run_id
+        error = predictions['y'] - predictions['yhat']
+        predictions['abs_error'] = error.abs()
+        predictions['squared_error'] = error ** 2
+        predictions['ape'] = (error / predictions['y']).abs().where(predictions['y'] != 0)
+        return predictions
+
+    def run(self, series_data, model_params=None):
+        """
+        Backtests every series in `series_data` ({name: cleaned monthly frame}).
+        Returns:
+            pandas.DataFrame: MAE, RMSE and MAPE per series and horizon step for this run.
+        """
+        run_id = pd.Timestamp.now().strftime("%Y-%m-%d_%H-%M-%S")
+        model_params = model_params or {}
+        results = []
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for series, data in series_data.items():
+                prophet_data = data[['Date', 'QTY_MT']].rename(columns={'Date': 'ds', 'QTY_MT': 'y'}).reset_index(drop=True)
+                folds = rolling_origin_splits(len(prophet_data), self.initial, self.horizon, self.period)
+                self.logger.info(f"{series}: {len(folds)} cutoffs")
+                for train_end, _ in folds:
+                    # Same parameters ProphetTrainer uses: the tuned config, else its defaults
+                    future = executor.submit(backtest_fold, series, prophet_data,
+                                             model_params.get(series) or default_prophet_params(),
+                                             train_end, self.horizon)
+                    futures[future] = (series, train_end)
+
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    series, train_end = futures[future]
+                    self.logger.error(f"Backtest fold failed for {series} at row {train_end}: {e}", exc_info=True)
+
+        if not results:
+            self.logger.warning("No backtest folds completed")
+            return pd.DataFrame()
+
+        predictions = self._score(pd.concat(results, ignore_index=True), run_id)
+        columns = [column.name for column in backtest_metrics.columns]
+        bulk_insert(predictions[columns], backtest_metrics.name, self.engine)
+        self.logger.info(f"Stored {len(predictions)} backtest rows for run {run_id}")
+
+        summary = self.horizon_summary(run_id=run_id)
+        self.logger.info(f"Backtest summary:\n{summary.to_string(index=False)}\n")
+        return summary
+
+    def horizon_summary(self, series=None, run_id=None):
+        """MAE, RMSE and MAPE per series and horizon step, optionally for one series / run."""
+        query = select(
+            backtest_metrics.c.series, backtest_metrics.c.run_id, backtest_metrics.c.horizon,
+            func.count().label('cutoffs'),
+            func.avg(backtest_metrics.c.abs_error).label('MAE'),
+            func.avg(backtest_metrics.c.squared_error).label('MSE'),
+            func.avg(backtest_metrics.c.ape).label('MAPE'),
+        ).group_by(backtest_metrics.c.series, backtest_metrics.c.run_id, backtest_metrics.c.horizon)
+        if series is not None:
+            query = query.where(backtest_metrics.c.series == series)
+        if run_id is not None:
+            query = query.where(backtest_metrics.c.run_id == run_id)
+
+        with self.engine.connect() as conn:
+            summary = pd.read_sql(query.order_by(backtest_metrics.c.series, backtest_metrics.c.horizon), conn)
+        summary.insert(5, 'RMSE', np.sqrt(summary.pop('MSE')))
+        return summary
@@ -2,26 +2,103 @@ import pandas as pd
 import numpy as np 
 import sys
 import os
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from Logging.logger import get_logger
-import plotly.graph_objects as go
-import json
-import re
-from plotly.subplots import make_subplots
 
 
-# For Configuration of file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-with open(os.path.join(BASE_DIR, '..', 'config.json'), "r") as f:
-    config = json.load(f)
+REPORT_DIR = os.path.join(BASE_DIR, "Reports", "Figures")
+RENDER_VERSION = 1                      # Bump when the figure changes so every report is re-rendered
 
 #Logging initiated
 logger = get_logger("evalution-logger")
 
-def interactive_evalution(data,forecast_future,prophet_data_pred,State):
-    
+def forecast_hash(data, forecast_future, prophet_data_pred, State, horizon):
+    """SHA-256 over everything a report shows; equal hashes render identical figures."""
+    digest = hashlib.sha256(f"{RENDER_VERSION}|{State}|{horizon}".encode())
+    for frame in (data[['ds', 'y']], forecast_future[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], prophet_data_pred[['ds', 'yhat']]):
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _ensure_plotly_bundle(report_dir):
+    """Writes plotly.min.js once per report folder; every report references this shared copy."""
+    bundle_path = os.path.join(report_dir, "plotly.min.js")
+    if not os.path.exists(bundle_path):
+        from plotly.offline import get_plotlyjs
+
+        tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        os.replace(tmp_path, bundle_path)            # Atomic, so parallel renderers never see half a file
+
+
+def interactive_evalution(data,forecast_future,prophet_data_pred,State,horizon=3,report_dir=REPORT_DIR):
+    """
+    Writes Graph_<State>_<date>.html unless the report for the same forecast already exists.
+    Returns the path of the current report.
+    """
+    manifest_path = os.path.join(report_dir, "manifest", f"{State}.json")
+    report_hash = forecast_hash(data, forecast_future, prophet_data_pred, State, horizon)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        # Stored relative to report_dir so the folder can be moved or shared
+        kept_path = os.path.join(report_dir, manifest['file'])
+        if manifest['hash'] == report_hash and os.path.exists(kept_path):
+            logger.info(f"{State}: forecast unchanged, report {kept_path} kept")
+            return kept_path
+
+    fig = build_figure(data, forecast_future, prophet_data_pred, State, horizon)
+    timestamp = pd.Timestamp.now().strftime("%Y-%m-%d")
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    _ensure_plotly_bundle(report_dir)
+    report_path = os.path.join(report_dir, f"Graph_{State}_{timestamp}.html")
+    fig.write_html(report_path, include_plotlyjs='directory')
+
+    with open(manifest_path, "w") as f:
+        json.dump({'hash': report_hash, 'file': os.path.relpath(report_path, report_dir), 'rendered_at': pd.Timestamp.now().isoformat()}, f, indent=4)
+    logger.info(f"{State}: report written to {report_path}")
+    return report_path
+
+
+def render_reports(reports, max_workers=1, report_dir=REPORT_DIR):
+    """
+    Renders many reports in parallel.
+
+    Parameters:
+    reports (dict): series -> (data, forecast_future, prophet_data_pred, horizon).
+    max_workers (int): Worker processes.
+
+    Returns:
+    dict: series -> None on success, else the error message.
+    """
+    errors = {}
+    with ProcessPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(interactive_evalution, data, forecast_future, prophet_data_pred, State, horizon, report_dir): State
+            for State, (data, forecast_future, prophet_data_pred, horizon) in reports.items()
+        }
+        for future in as_completed(futures):
+            State = futures[future]
+            try:
+                future.result()
+                errors[State] = None
+            except Exception as e:
+                logger.error(f"Error rendering report for {State}: {e}", exc_info=True)
+                errors[State] = str(e)
+    return errors
+
+
+def build_figure(data,forecast_future,prophet_data_pred,State,horizon=3):
+    # Deferred so that importing the pipeline does not pull in plotly
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     # Subplots (Graph and Table)
     fig = make_subplots(
         rows = 2, cols = 1,
@@ -61,8 +138,8 @@ def interactive_evalution(data,forecast_future,prophet_data_pred,State):
     # Plot Future Forecast 
     fig.add_trace(
         go.Scatter(
-            x = forecast_future['ds'][-3:],
-            y = forecast_future['yhat'][-3:],
+            x = forecast_future['ds'][-horizon:],
+            y = forecast_future['yhat'][-horizon:],
             mode = 'lines+markers',
             name = 'Forecast',
             line = dict(color = 'orange', width = 2)
@@ -78,10 +155,10 @@ def interactive_evalution(data,forecast_future,prophet_data_pred,State):
             ),
             cells=dict(
                 values = [
-                    forecast_future['ds'][-4:].dt.strftime('%B-%Y'),
-                    forecast_future['yhat'][-4:].round(2),
-                    forecast_future['yhat_lower'][-4:].round(2),
-                    forecast_future['yhat_upper'][-4:].round(2)
+                    forecast_future['ds'][-(horizon + 1):].dt.strftime('%B-%Y'),
+                    forecast_future['yhat'][-(horizon + 1):].round(2),
+                    forecast_future['yhat_lower'][-(horizon + 1):].round(2),
+                    forecast_future['yhat_upper'][-(horizon + 1):].round(2)
                 ],
                 fill_color = 'lavender',
                 align = 'center'
@@ -98,7 +175,4 @@ def interactive_evalution(data,forecast_future,prophet_data_pred,State):
         height=700
 
     )
-    timestamp = pd.Timestamp.now().strftime("%Y-%m-%d")
-    report_dir = os.path.join(BASE_DIR, "Reports", "Figures")
-    os.makedirs(report_dir, exist_ok=True)
-    fig.write_html(os.path.join(report_dir, f"Graph_{State}_{timestamp}.html"))
\ No newline at end of file
+    return fig
\ No newline at end of file
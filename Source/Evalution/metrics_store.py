@@ -0,0 +1,162 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import json
+import csv
+import glob
+from sqlalchemy import MetaData, Table, Column, Index, String, Float, DateTime, select, func, and_
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..','..')))
+from Logging.logger import get_logger
+from Source.Database.db_con import get_sqlite_engine
+from Source.Database.bulk_load import bulk_insert
+from Source.Utils.series import series_name
+from Source.Utils.storage import resolve_path
+
+
+metadata = MetaData()
+model_metrics = Table(
+    'model_metrics', metadata,
+    Column('series', String(128), nullable=False),
+    Column('model', String(64), nullable=False),
+    Column('run_id', String(32), nullable=False),
+    Column('recorded_at', DateTime, nullable=False),
+    Column('MAE', Float),
+    Column('RMSE', Float),
+    Column('R2', Float),
+    Column('source', String(16), nullable=False),
+    Index('ix_metrics_series_model_time', 'series', 'model', 'recorded_at'),
+    Index('ix_metrics_run', 'run_id', 'series', 'model', unique=True),
+)
+
+
+def get_metrics_engine(config):
+    """Engine for the embedded metrics database (SQLite file at metrics_db)."""
+    return get_sqlite_engine(resolve_path(config.get('metrics_db', 'Reports\\models\\metrics.db')))
+
+
+class MetricsStore:
+    """
+    In-sample accuracy of every series, model and run, in the model_metrics table of
+    the metrics database (shared with the backtest results).
+    """
+
+    def __init__(self, config_path):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("Metrics-Store")
+        self.engine = get_metrics_engine(self.config)
+        metadata.create_all(self.engine, tables=[model_metrics])
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _existing_keys(self, conn, run_ids):
+        keys = set()
+        run_ids = list(run_ids)
+        for start in range(0, len(run_ids), 500):
+            query = select(model_metrics.c.run_id, model_metrics.c.series, model_metrics.c.model).where(
+                model_metrics.c.run_id.in_(run_ids[start:start + 500]))
+            keys.update(tuple(row) for row in conn.execute(query))
+        return keys
+
+    def _store(self, rows, source):
+        """Inserts rows in one transaction, skipping (run_id, series, model) keys already stored."""
+        try:
+            rows = rows.copy()
+            for column in ('MAE', 'RMSE', 'R2'):
+                rows[column] = pd.to_numeric(rows[column], errors='coerce') if column in rows else np.nan
+            rows['source'] = source
+            rows = rows[[column.name for column in model_metrics.columns]].drop_duplicates(['run_id', 'series', 'model'])
+
+            with self.engine.begin() as conn:
+                existing = self._existing_keys(conn, rows['run_id'].unique())
+                new = ~pd.Series(list(zip(rows['run_id'], rows['series'], rows['model'])), index=rows.index).isin(existing)
+                inserted = bulk_insert(rows[new], model_metrics.name, conn)
+            self.logger.info(f"Stored {inserted} metric rows ({len(rows) - inserted} already present)\n")
+            return inserted
+        except Exception as e:
+            self.logger.error(f"Error storing metrics: {e}", exc_info=True)
+            raise ValueError("Error Occured while saving the metrics")
+
+    def write(self, metrics, run_id):
+        """
+        Stores the metrics of one pipeline run in a single batch.
+
+        Parameters:
+        metrics (dict): series name -> {'model', 'MAE', 'RMSE', 'R2'}.
+        run_id (str): Run timestamp ('%Y-%m-%d_%H-%M-%S'), also used as recorded_at.
+        """
+        metrics = {name: values for name, values in metrics.items() if values}
+        if not metrics:
+            self.logger.warning("No metrics to store")
+            return 0
+        rows = pd.DataFrame([{'series': name, **values} for name, values in metrics.items()])
+        rows['run_id'] = run_id
+        recorded_at = pd.to_datetime(run_id, format='%Y-%m-%d_%H-%M-%S', errors='coerce')
+        rows['recorded_at'] = pd.Timestamp.now() if pd.isna(recorded_at) else recorded_at
+        return self._store(rows, 'pipeline')
+
+    def trend(self, series, model=None, since=None):
+        """Metrics of one series over time, oldest first."""
+        query = select(model_metrics).where(model_metrics.c.series == series)
+        if model is not None:
+            query = query.where(model_metrics.c.model == model)
+        if since is not None:
+            query = query.where(model_metrics.c.recorded_at >= pd.Timestamp(since).to_pydatetime())
+        with self.engine.connect() as conn:
+            return pd.read_sql(query.order_by(model_metrics.c.recorded_at), conn, parse_dates=['recorded_at'])
+
+    def latest(self, model=None):
+        """The most recent metrics of every series (and model)."""
+        last = select(
+            model_metrics.c.series, model_metrics.c.model, func.max(model_metrics.c.recorded_at).label('recorded_at')
+        ).group_by(model_metrics.c.series, model_metrics.c.model)
+        if model is not None:
+            last = last.where(model_metrics.c.model == model)
+        last = last.subquery()
+        query = select(model_metrics).join(last, and_(
+            model_metrics.c.series == last.c.series,
+            model_metrics.c.model == last.c.model,
+            model_metrics.c.recorded_at == last.c.recorded_at,
+        ))
+        with self.engine.connect() as conn:
+            return pd.read_sql(query.order_by(model_metrics.c.series), conn, parse_dates=['recorded_at'])
+
+    def _report_files(self):
+        """Model_Report CSVs from the model_evaluation_<series> keys and under model_dir, with their series."""
+        files = {resolve_path(path): key[len('model_evaluation_'):]
+                 for key, path in self.config.items() if key.startswith('model_evaluation_') and path}
+        model_dir = resolve_path(self.config.get('model_dir', 'Reports\\models'))
+        for path in glob.glob(os.path.join(model_dir, 'Model_Report*.csv')):
+            stem = os.path.splitext(os.path.basename(path))[0]
+            files.setdefault(path, stem[len('Model_Report_'):] if stem.startswith('Model_Report_') else 'All')
+        return {path: series for path, series in files.items() if os.path.exists(path)}
+
+    def migrate_csv_reports(self):
+        """
+        Imports the append-only Model_Report CSVs. Blank lines, repeated headers and the
+        forecast columns some runs appended are dropped, and each (series, model, run)
+        is stored once, so the migration can be re-run safely.
+        """
+        frames = []
+        for path, file_series in self._report_files().items():
+            # Row widths vary (trailing commas, appended forecast columns), so only the first four fields are read
+            with open(path, newline='') as f:
+                report = pd.DataFrame([row[:4] for row in csv.reader(f) if len(row) >= 4],
+                                      columns=['Date', 'Model', 'MAE', 'RMSE'])
+            report['recorded_at'] = pd.to_datetime(report['Date'], format='%Y-%m-%d_%H-%M-%S', errors='coerce')
+            report = report.dropna(subset=['recorded_at', 'Model'])
+            # 'Prophet_<series>'; older rows only say 'Prophet' and belong to the file's series
+            parts = report['Model'].str.split('_', n=1, expand=True).reindex(columns=[0, 1])
+            report['model'] = parts[0]
+            report['series'] = parts[1].fillna(file_series).map(lambda name: series_name([name]))
+            report['run_id'] = report['Date']
+            frames.append(report)
+            self.logger.info(f"Read {len(report)} rows from {path}")
+
+        if not frames:
+            self.logger.info("No Model_Report CSVs to migrate")
+            return 0
+        rows = pd.concat(frames, ignore_index=True)
+        return self._store(rows[['series', 'model', 'run_id', 'recorded_at', 'MAE', 'RMSE']], 'csv')
@@ -0,0 +1,185 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import json
+import hashlib
+import shutil
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Logging.logger import get_logger
+from Source.Utils.helpers import add_calendar_features
+from Source.Utils.series import series_names
+from Source.Utils.storage import save_dataset, load_dataset, dataset_path, resolve_path
+
+# Lag, rolling, year-over-year and season features for every series.
+# Series are laid out as one series x month matrix, so each feature is a single
+# array operation over all series instead of a groupby per series.
+
+FEATURE_VERSION = 1                     # Bump when a feature definition changes; forces a rebuild
+LAGS = [1, 2, 3, 6, 12]
+ROLLING_WINDOWS = [3, 12]
+
+
+def stack_series(series_data):
+    """Long (series, Date, QTY_MT) frame from {series name: monthly frame}."""
+    frames = list(series_data.values())
+    return pd.DataFrame({
+        'series': np.repeat(list(series_data), [len(data) for data in frames]),
+        'Date': np.concatenate([data['Date'].to_numpy() for data in frames]),
+        'QTY_MT': np.concatenate([data['QTY_MT'].to_numpy(dtype=float) for data in frames]),
+    })
+
+
+def series_matrix(long, series=None, freq='MS'):
+    """
+    Lays every series of a long (series, Date, QTY_MT) frame out on one monthly calendar.
+
+    Returns:
+    tuple: (Y, dates) where Y is a series x months array in the order of `series`
+    (default: sorted); months inside a series without sales are 0 and months before
+    its first sale are NaN.
+    """
+    wide = long.pivot_table(index='series', columns='Date', values='QTY_MT', aggfunc='sum')
+    dates = pd.date_range(wide.columns.min(), wide.columns.max(), freq=freq)
+    wide = wide.reindex(index=list(series) if series is not None else wide.index, columns=dates)
+    started = wide.notna().cumsum(axis=1) > 0
+    return wide.fillna(0.0).where(started).to_numpy(), dates
+
+
+def compute_features(Y, dates, cols):
+    """
+    Feature rows for the months `cols` of every series in Y, ordered month by month.
+    Features only look at earlier months, so the same code builds the stored table,
+    a model's training set and each step of a recursive forecast.
+    """
+    n_series = Y.shape[0]
+    cols = np.asarray(cols)
+
+    def shifted(lag):
+        idx = cols - lag
+        values = Y[:, np.clip(idx, 0, None)]
+        values[:, idx < 0] = np.nan
+        return values                                        # series x len(cols)
+
+    lagged = {lag: shifted(lag) for lag in range(1, max(LAGS + ROLLING_WINDOWS) + 2)}
+    features = {f'lag_{lag}': lagged[lag].T.ravel() for lag in LAGS}
+    for window in ROLLING_WINDOWS:
+        stack = np.stack([lagged[lag] for lag in range(1, window + 1)])
+        features[f'rolling_mean_{window}'] = stack.mean(axis=0).T.ravel()
+        features[f'rolling_std_{window}'] = stack.std(axis=0).T.ravel()
+    # Last month against the same month a year before it
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features['yoy_change'] = np.where(lagged[13] != 0, lagged[1] / lagged[13] - 1, np.nan).T.ravel()
+
+    # Same calendar as the cleaned data; computed once per month, then repeated for every series
+    calendar = add_calendar_features(pd.DataFrame({'Date': dates[cols]}), 'Date')
+    features['month'] = np.repeat(calendar['Num_Month'].to_numpy(), n_series)
+    features['year'] = np.repeat(calendar['Year'].to_numpy(), n_series)
+    features['kharif'] = np.repeat((calendar['Season'] == 'Kharif').to_numpy(), n_series).astype(int)
+    features['series'] = np.tile(np.arange(n_series), len(cols))
+    return pd.DataFrame(features)
+
+
+class FeatureStore:
+    """
+    Versioned feature table built from the monthly aggregated data.
+
+    The last stored month is treated as open (invoices keep arriving), so an update
+    recomputes it and appends any newer months. The table is rebuilt when FEATURE_VERSION,
+    the set of series or any earlier month of history changes.
+    """
+
+    def __init__(self, config_path, series_keys=None):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("Feature-Store")
+        self.series_keys = series_keys or self.config.get('series_keys', ['State'])
+        self.freq = self.config.get('forecast_freq', 'MS')
+        # Same storage backend as the processed data, under the feature directory
+        self.storage_config = {**self.config, 'storage_dir': self.config.get('feature_dir', 'Data\\features')}
+        self.name = f'features_v{FEATURE_VERSION}'
+        self.meta_path = os.path.join(resolve_path(self.storage_config['storage_dir']), f'{self.name}_meta.json')
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _history_hash(self, Y):
+        return hashlib.sha256(np.ascontiguousarray(np.nan_to_num(Y, nan=-1.0)).tobytes()).hexdigest()
+
+    def _load_meta(self):
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, "r") as f:
+            return json.load(f)
+
+    def _feature_rows(self, Y, dates, series, cols):
+        features = compute_features(Y, dates, cols).drop(columns='series')
+        features.insert(0, 'series', np.tile(series, len(cols)))
+        features.insert(1, 'Date', np.repeat(dates[cols], len(series)))
+        features.insert(2, 'QTY_MT', Y[:, cols].T.ravel())
+        features['period'] = np.repeat(dates[cols].strftime('%Y-%m'), len(series))
+        return features[features['QTY_MT'].notna()].reset_index(drop=True)
+
+    def update(self, data):
+        """
+        Brings the feature table up to date with `data` (output of the monthly aggregation).
+        Returns:
+            pandas.DataFrame: The feature rows written by this call (empty when up to date).
+        """
+        try:
+            # Names are built once per series, not once per row
+            codes, uniques = pd.MultiIndex.from_frame(data[self.series_keys]).factorize()
+            names = np.array(series_names(uniques), dtype=object)
+            keep = codes >= 0
+            long = pd.DataFrame({'series': names[codes[keep]], 'Date': data['Date'].to_numpy()[keep],
+                                 'QTY_MT': data['QTY_MT'].to_numpy()[keep]})
+            series = sorted(names)
+            Y, dates = series_matrix(long, series, self.freq)
+
+            meta = self._load_meta()
+            path = dataset_path(self.name, self.storage_config)
+            # Partitioned Parquet only; a CSV table is a single file and is always rebuilt
+            incremental = (
+                meta is not None and os.path.isdir(path)
+                and meta['series'] == series
+                and pd.Timestamp(meta['first_date']) == dates[0]
+                and pd.Timestamp(meta['last_date']) <= dates[-1]
+                and meta['history_hash'] == self._history_hash(Y[:, :meta['months'] - 1])
+            )
+
+            if incremental:
+                if meta['months'] == len(dates) and meta['last_hash'] == self._history_hash(Y[:, -1:]):
+                    self.logger.info("Feature table is up to date\n")
+                    return pd.DataFrame()
+                new_cols = list(range(meta['months'] - 1, len(dates)))
+                features = self._feature_rows(Y, dates, series, new_cols)
+                # Only the open month's partition is replaced; older partitions are not touched
+                shutil.rmtree(os.path.join(path, f"period={meta['last_date'][:7]}"), ignore_errors=True)
+                features.to_parquet(path, engine='pyarrow', index=False, partition_cols=['period'],
+                                    compression=self.storage_config.get('storage_compression', 'snappy'))
+                self.logger.info(f"Updated {len(new_cols)} month(s), {len(features)} rows in {path}")
+            else:
+                features = self._feature_rows(Y, dates, series, range(len(dates)))
+                save_dataset(features, self.name, self.storage_config, partition_cols=['period'])
+                self.logger.info(f"Rebuilt feature table: {len(series)} series, {len(features)} rows at {path}")
+
+            with open(self.meta_path, "w") as f:
+                json.dump({
+                    'version': FEATURE_VERSION,
+                    'series_keys': self.series_keys,
+                    'series': series,
+                    'first_date': str(dates[0].date()),
+                    'last_date': str(dates[-1].date()),
+                    'months': len(dates),
+                    'history_hash': self._history_hash(Y[:, :-1]),
+                    'last_hash': self._history_hash(Y[:, -1:]),
+                }, f, indent=4)
+            return features
+        except Exception as e:
+            self.logger.error(f"Error building features: {e}", exc_info=True)
+            raise ValueError("Error Occured while building the feature table")
+
+    def load(self, series=None, columns=None):
+        """Reads the feature table, optionally for some series / columns only."""
+        filters = [('series', 'in', list(series))] if series is not None else None
+        return load_dataset(self.name, self.storage_config, columns=columns, filters=filters)
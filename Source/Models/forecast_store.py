@@ -0,0 +1,118 @@
+import pandas as pd
+import os
+import sys
+import json
+from sqlalchemy import MetaData, Table, Column, Index, String, Float, Boolean, DateTime, select, delete, and_, or_
+
+# Adjust path to import custom modules
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..')))
+from Logging.logger import get_logger
+from Source.Database.db_con import get_sqlite_engine
+from Source.Database.bulk_load import bulk_insert
+from Source.Utils.storage import resolve_path
+
+
+metadata = MetaData()
+forecasts = Table(
+    'forecasts', metadata,
+    Column('series', String(128), nullable=False),
+    Column('ds', DateTime, nullable=False),
+    Column('y', Float),
+    Column('yhat', Float),
+    Column('yhat_lower', Float),
+    Column('yhat_upper', Float),
+    Column('is_future', Boolean, nullable=False),
+    Column('model', String(64), nullable=False),
+    Column('model_version', String(64)),
+    Column('run_id', String(32), nullable=False),
+    Index('ix_forecasts_series_ds', 'series', 'ds', unique=True),
+    Index('ix_forecasts_run', 'run_id'),
+)
+
+
+def forecast_rows(prophet_data, forecast_future, model, model_version=None):
+    """
+    Table rows for one series: history (with actuals) plus the forecast horizon.
+
+    Parameters:
+    prophet_data (pd.DataFrame): ds / y actuals.
+    forecast_future (pd.DataFrame): ds / yhat / yhat_lower / yhat_upper over history and horizon.
+    model (str): Engine that produced the forecast, e.g. 'Prophet'.
+    model_version (str): Identifies the fitted model (fingerprint or artifact hash).
+    """
+    rows = forecast_future[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].merge(prophet_data[['ds', 'y']], on='ds', how='left')
+    rows['is_future'] = rows['ds'] > prophet_data['ds'].max()
+    rows['model'] = model
+    rows['model_version'] = model_version
+    return rows
+
+
+class ForecastStore:
+    """
+    One indexed table with the latest history + horizon forecast of every series.
+
+    Each run replaces the rows of the series it forecast in a single transaction, so
+    readers always see a complete forecast per series; run_id says which run wrote it.
+    """
+
+    def __init__(self, config_path):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("Forecast-Store")
+        self.engine = get_sqlite_engine(resolve_path(self.config.get('forecast_db', 'Reports\\models\\forecasts.db')))
+        metadata.create_all(self.engine, tables=[forecasts])
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def materialize(self, series_rows, run_id):
+        """Replaces the stored forecast of every series in `series_rows` ({series: forecast_rows(...)})."""
+        try:
+            series_rows = {name: rows for name, rows in series_rows.items() if rows is not None}
+            if not series_rows:
+                self.logger.warning("No forecasts to materialize")
+                return 0
+            rows = pd.concat([rows.assign(series=name) for name, rows in series_rows.items()], ignore_index=True)
+            rows['run_id'] = run_id
+            rows = rows[[column.name for column in forecasts.columns]]
+
+            with self.engine.begin() as conn:
+                names = list(series_rows)
+                for start in range(0, len(names), 500):
+                    conn.execute(delete(forecasts).where(forecasts.c.series.in_(names[start:start + 500])))
+                bulk_insert(rows, forecasts.name, conn)
+            self.logger.info(f"Materialized {len(rows)} forecast rows for {len(series_rows)} series (run {run_id})\n")
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"Error materializing forecasts: {e}", exc_info=True)
+            raise ValueError("Error Occured while saving the forecast table")
+
+    def query(self, requests, future_only=False):
+        """
+        Reads many series / date ranges in one indexed query.
+
+        Parameters:
+        requests (list): dicts with 'series' and optional 'start' / 'end' dates (inclusive).
+        future_only (bool): Only return forecast-horizon rows.
+
+        Returns:
+        pd.DataFrame: Matching rows ordered by series and ds (empty when no series is requested).
+        """
+        if not requests:
+            return pd.DataFrame(columns=[column.name for column in forecasts.columns])
+
+        conditions = []
+        for request in requests:
+            condition = [forecasts.c.series == request['series']]
+            if request.get('start') is not None:
+                condition.append(forecasts.c.ds >= pd.Timestamp(request['start']).to_pydatetime())
+            if request.get('end') is not None:
+                condition.append(forecasts.c.ds <= pd.Timestamp(request['end']).to_pydatetime())
+            conditions.append(and_(*condition))
+
+        query = select(forecasts).where(or_(*conditions))
+        if future_only:
+            query = query.where(forecasts.c.is_future.is_(True))
+        with self.engine.connect() as conn:
+            return pd.read_sql(query.order_by(forecasts.c.series, forecasts.c.ds), conn, parse_dates=['ds'])
@@ -0,0 +1,193 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+# Adjust path to import custom modules
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..')))
+from Logging.logger import get_logger
+from Source.Utils.series import series_names
+from Source.Utils.storage import save_dataset
+
+TOTAL = 'Total'
+
+
+def build_hierarchy(df, levels, value_col='QTY_MT'):
+    """
+    Aggregates monthly data into every node of a Total > levels[0] > ... > levels[-1] hierarchy.
+
+    Parameters:
+    df (pd.DataFrame): Monthly data with Date, the level columns and `value_col`.
+    levels (list): Hierarchy columns from top to bottom, e.g. ['State', 'District'].
+
+    Returns:
+    tuple: (Y, nodes, A) where Y is a nodes x months DataFrame (aggregates first, then the
+    bottom series, missing months as 0), nodes has the name/level of each row and A is the
+    aggregation matrix, so the summing matrix is S = [A; I].
+    """
+    bottom = df.pivot_table(index=levels, columns='Date', values=value_col, aggfunc='sum', fill_value=0.0)
+    bottom_keys = bottom.index.to_frame(index=False)
+    n_bottom = len(bottom)
+
+    names, node_levels, rows = [TOTAL], [TOTAL], [np.ones(n_bottom, dtype=bool)]
+    for depth in range(1, len(levels)):
+        codes, uniques = pd.MultiIndex.from_frame(bottom_keys[levels[:depth]]).factorize()
+        for code, name in enumerate(series_names(uniques)):
+            names.append(name)
+            node_levels.append(levels[depth - 1])
+            rows.append(codes == code)
+    A = np.vstack(rows).astype(float)
+
+    names += series_names(bottom_keys.itertuples(index=False))
+    node_levels += [levels[-1]] * n_bottom
+    Y = np.vstack([A @ bottom.to_numpy(), bottom.to_numpy()])
+    nodes = pd.DataFrame({'node': names, 'level': node_levels})
+    return pd.DataFrame(Y, index=names, columns=bottom.columns), nodes, A
+
+
+def summing_matrix(A):
+    """S = [A; I]: maps bottom-level series to every node of the hierarchy."""
+    return np.vstack([A, np.eye(A.shape[1])])
+
+
+def reconcile(base, A, method='wls_struct'):
+    """
+    Makes base forecasts coherent (every aggregate equals the sum of its children).
+
+    Parameters:
+    base (np.ndarray): nodes x horizon base forecasts, rows ordered as in build_hierarchy.
+    A (np.ndarray): Aggregation matrix from build_hierarchy.
+    method (str): 'bottom_up', 'ols' (identity weights) or 'wls_struct'
+        (each node weighted by the inverse of the number of bottom series under it).
+
+    Returns:
+    np.ndarray: nodes x horizon reconciled forecasts.
+
+    The optimal-combination methods compute S (S'WS)^-1 S'W y for all horizons at once. With
+    S = [A; I] and W diagonal, S'WS = W_b + A'W_aA, which the Woodbury identity inverts
+    with a solve over the (few) aggregate nodes instead of the thousands of bottom series.
+    """
+    n_agg, n_bottom = A.shape
+    base = np.asarray(base, dtype=float)
+    base_agg, base_bottom = base[:n_agg], base[n_agg:]
+
+    if method == 'bottom_up':
+        bottom = base_bottom
+    elif method in ('ols', 'wls_struct'):
+        w_agg = np.ones(n_agg) if method == 'ols' else 1.0 / A.sum(axis=1)
+        w_bottom = np.ones(n_bottom)
+        d = 1.0 / w_bottom
+        rhs = A.T @ (w_agg[:, None] * base_agg) + w_bottom[:, None] * base_bottom
+        # (W_b + A'W_aA)^-1 = D - DA'(W_a^-1 + ADA')^-1 AD with D = W_b^-1
+        inner = np.diag(1.0 / w_agg) + (A * d) @ A.T
+        bottom = d[:, None] * rhs - (d[:, None] * A.T) @ np.linalg.solve(inner, A @ (d[:, None] * rhs))
+    else:
+        raise ValueError(f"Unknown reconciliation method: {method}")
+
+    return np.vstack([A @ bottom, bottom])
+
+
+def forecast_node(y, dates, params, horizon, freq='MS', max_iter=1000):
+    """
+    Base Prophet forecast for one node; returns (yhat, yhat_lower, yhat_upper) for the horizon.
+    Runs in a worker process.
+    """
+    from prophet import Prophet
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    model = Prophet(**params)
+    model.fit(pd.DataFrame({'ds': dates, 'y': y}), iter=max_iter)
+    future = model.make_future_dataframe(periods=horizon, freq=freq, include_history=False)
+    forecast = model.predict(future)
+    return tuple(forecast[col].to_numpy() for col in ('yhat', 'yhat_lower', 'yhat_upper'))
+
+
+class HierarchicalForecaster:
+    """
+    Forecasts every node of the Total > State > District hierarchy with Prophet and
+    reconciles the levels so they add up.
+    """
+
+    def __init__(self, config_path):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("Hierarchical-Forecast")
+        self.levels = self.config.get('hierarchy_levels', ['State', 'District'])
+        self.method = self.config.get('hierarchy_reconciliation', 'wls_struct')
+        self.horizon = self.config.get('forecast_horizon', 3)
+        self.freq = self.config.get('forecast_freq', 'MS')
+        self.max_iter = self.config.get('tuning_max_iter', 1000)
+        self.max_workers = self.config.get('parallel_workers', 1)
+        self.model_params = {
+            'seasonality_mode': 'additive',              # District series are sparse and often zero
+            'yearly_seasonality': True,
+            'weekly_seasonality': False,
+            'daily_seasonality': False,
+            'interval_width': 0.80,
+        }
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _seasonal_naive(self, y):
+        """Fallback when a node's fit fails: the same months one year earlier."""
+        history = y[-12:] if len(y) >= 12 else np.full(12, y[-1] if len(y) else 0.0)
+        return np.resize(history, self.horizon)
+
+    def base_forecasts(self, Y):
+        """Returns (yhat, lower, upper) arrays of shape nodes x horizon."""
+        dates = Y.columns
+        yhat = np.empty((len(Y), self.horizon))
+        lower, upper = np.empty_like(yhat), np.empty_like(yhat)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(forecast_node, Y.iloc[i].to_numpy(), dates, self.model_params,
+                                       self.horizon, self.freq, self.max_iter)
+                       for i in range(len(Y))]
+            for i, future in enumerate(futures):
+                try:
+                    yhat[i], lower[i], upper[i] = future.result()
+                except Exception as e:
+                    self.logger.warning(f"{Y.index[i]}: fit failed ({e}), using seasonal naive")
+                    yhat[i] = lower[i] = upper[i] = self._seasonal_naive(Y.iloc[i].to_numpy())
+        return yhat, lower, upper
+
+    def run(self, data):
+        """
+        Forecasts and reconciles the hierarchy built from `data` (monthly data with the
+        hierarchy_levels columns) and stores it as the hierarchical_forecast dataset.
+        Returns:
+            pandas.DataFrame: one row per node and forecast month.
+        """
+        try:
+            Y, nodes, A = build_hierarchy(data, self.levels)
+            self.logger.info(f"Hierarchy: {len(nodes)} nodes, {A.shape[1]} bottom series, {Y.shape[1]} months")
+
+            yhat, lower, upper = self.base_forecasts(Y)
+            reconciled = reconcile(yhat, A, self.method)
+            # Intervals are not reconciled; they move with their point forecast
+            shift = reconciled - yhat
+            incoherence = np.abs(A @ reconciled[A.shape[0]:] - reconciled[:A.shape[0]]).max()
+            self.logger.info(f"Reconciled with {self.method}, max incoherence {incoherence:.2e}")
+
+            future_dates = pd.date_range(Y.columns[-1], periods=self.horizon + 1, freq=self.freq)[1:]
+            result = pd.DataFrame({
+                'node': np.repeat(nodes['node'].to_numpy(), self.horizon),
+                'level': np.repeat(nodes['level'].to_numpy(), self.horizon),
+                'ds': np.tile(future_dates, len(nodes)),
+                'yhat_base': yhat.ravel(),
+                'yhat': reconciled.ravel(),
+                'yhat_lower': (lower + shift).ravel(),
+                'yhat_upper': (upper + shift).ravel(),
+                'method': self.method,
+            })
+            path = save_dataset(result, 'hierarchical_forecast', self.config, partition_cols=['level'],
+                                csv_path=self.config.get('hierarchical_forecast'))
+            self.logger.info(f"Hierarchical forecast saved to {path}\n")
+            return result
+        except Exception as e:
+            self.logger.error(f"Error in hierarchical forecasting: {e}", exc_info=True)
+            raise ValueError("Error in Hierarchical forecasting Part")
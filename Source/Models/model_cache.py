@@ -0,0 +1,83 @@
+import pandas as pd 
+import os
+import sys
+import json
+import time
+import hashlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Logging.logger import get_logger
+
+
+class ModelCache:
+    """
+    Disk cache of fitted Prophet models keyed on a fingerprint of the training data and parameters.
+
+    An entry is `<series>_<fingerprint>.json` (model_to_json output). Hits refresh the file's
+    mtime, and eviction keeps the `max_entries` most recently used entries per series and drops
+    anything unused for longer than `max_age_days`.
+    """
+
+    def __init__(self, cache_dir, max_entries=3, max_age_days=30):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.logger = get_logger("Model-Cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def fingerprint(self, prophet_data, model_params):
+        """SHA-256 over the ds/y values, the model parameters and the prophet version."""
+        import prophet
+
+        frame = pd.DataFrame({
+            'ds': prophet_data['ds'].astype('datetime64[ns]'),
+            'y': prophet_data['y'].astype('float64'),
+        })
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        digest.update(json.dumps(model_params, sort_keys=True, default=str).encode())
+        digest.update(prophet.__version__.encode())
+        return digest.hexdigest()
+
+    def _path(self, series, fingerprint):
+        return os.path.join(self.cache_dir, f"{series}_{fingerprint[:16]}.json")
+
+    def get(self, series, fingerprint):
+        """Returns the cached model, or None on a miss."""
+        from prophet.serialize import model_from_json
+
+        path = self._path(series, fingerprint)
+        if not os.path.exists(path):
+            self.logger.info(f"Cache miss for {series} ({fingerprint[:12]})")
+            return None
+        try:
+            with open(path, "r") as fin:
+                model = model_from_json(fin.read())
+        except Exception as e:
+            self.logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            os.remove(path)
+            return None
+        os.utime(path)
+        self.logger.info(f"Cache hit for {series} ({fingerprint[:12]})")
+        return model
+
+    def put(self, series, fingerprint, model):
+        """Stores a fitted model and evicts stale entries for the series."""
+        from prophet.serialize import model_to_json
+
+        with open(self._path(series, fingerprint), "w") as fout:
+            fout.write(model_to_json(model))
+        self.evict(series)
+
+    def evict(self, series):
+        prefix = f"{series}_"
+        entries = sorted(
+            (os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+             if name.startswith(prefix) and name.endswith('.json') and len(name) == len(prefix) + 21),
+            key=os.path.getmtime, reverse=True,
+        )
+        cutoff = time.time() - self.max_age_days * 86400
+        for rank, path in enumerate(entries):
+            if rank >= self.max_entries or os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                self.logger.info(f"Evicted {os.path.basename(path)}")
@@ -0,0 +1,184 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import json
+import time
+import importlib
+import hashlib
+
+# Adjust path to import custom modules
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..')))
+from Logging.logger import get_logger
+from Source.Utils.storage import resolve_path
+
+# The package directory name has a space, so it cannot be imported with a plain import statement
+build_features = importlib.import_module('Source.Feature generation.build_features')
+
+
+class LGBMTrainer:
+    """
+    Global LightGBM forecaster: one model over every series on the feature store's
+    lag, rolling, year-over-year and season features.
+
+    Forecasts are recursive; each step predicts all series in one batched call. The
+    interval comes from two quantile models. Forecasts and the (history + horizon)
+    frames returned by run() have the same layout as ProphetTrainer's; per-series
+    metrics are left in self.metrics for the metrics store.
+    """
+
+    def __init__(self, config_path):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("LightGBM-Global")
+        self.horizon = self.config.get('forecast_horizon', 3)
+        self.freq = self.config.get('forecast_freq', 'MS')
+        self.model_params = self.config.get('lgbm_params') or self._get_default_params()
+        interval_width = self.config.get('lgbm_interval_width', 0.80)
+        self.alphas = {'yhat_lower': (1 - interval_width) / 2, 'yhat_upper': (1 + interval_width) / 2}
+        self.models = {}
+        self.series = []
+        self.model_version = None
+        self.metrics = {}
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _get_default_params(self):
+        return {
+            'n_estimators': 400,
+            'learning_rate': 0.05,
+            'num_leaves': 31,
+            'min_child_samples': 10,
+            'subsample': 0.8,
+            'subsample_freq': 1,
+            'colsample_bytree': 0.8,
+            'verbose': -1,
+        }
+
+    def _artifact_path(self, key, file_name):
+        """Path configured as `<key>`, else `<file_name>` under model_dir."""
+        path = self.config.get(key) or os.path.join(self.config.get('model_dir', 'Reports\\models'), file_name)
+        return resolve_path(path)
+
+    def train(self, Y, dates):
+        """Fits the point model and the two quantile models on every observed month of every series."""
+        try:
+            import lightgbm as lgb                       # Deferred: only needed when this engine is picked
+
+            X = build_features.compute_features(Y, dates, range(1, Y.shape[1]))
+            y = Y[:, 1:].T.ravel()
+            observed = ~np.isnan(y)
+            X, y = X[observed], y[observed]
+            self.logger.info(f"Training on {len(y)} rows from {Y.shape[0]} series......")
+
+            start = time.perf_counter()
+            fit_args = {'categorical_feature': ['series']}
+            self.models['yhat'] = lgb.LGBMRegressor(**self.model_params).fit(X, y, **fit_args)
+            for name, alpha in self.alphas.items():
+                # The quantile objective and alpha override any objective / alpha set in lgbm_params
+                params = {**self.model_params, 'objective': 'quantile', 'alpha': alpha}
+                self.models[name] = lgb.LGBMRegressor(**params).fit(X, y, **fit_args)
+            self.logger.info(f"Model Training Complete in {time.perf_counter() - start:.2f}s\n")
+        except Exception as e:
+            self.logger.error(f"Error training LightGBM model: {e}", exc_info=True)
+            raise ValueError("Error in LightGBM Model training Part")
+
+    def forecast(self, Y, dates, periods=None):
+        """
+        In-sample predictions plus a recursive `periods`-step forecast for every series.
+        Returns:
+            dict: yhat / yhat_lower / yhat_upper arrays of shape series x (months + periods), and the dates.
+        """
+        periods = self.horizon if periods is None else periods
+        all_dates = dates.append(pd.date_range(dates[-1], periods=periods + 1, freq=self.freq)[1:])
+        path = np.hstack([Y, np.full((Y.shape[0], periods), np.nan)])
+
+        history = build_features.compute_features(Y, dates, range(Y.shape[1]))
+        out = {name: np.empty_like(path) for name in self.models}
+        for name, model in self.models.items():
+            out[name][:, :Y.shape[1]] = model.predict(history).reshape(Y.shape[1], -1).T
+
+        for col in range(Y.shape[1], path.shape[1]):
+            X = build_features.compute_features(path, all_dates, [col])
+            for name, model in self.models.items():
+                out[name][:, col] = model.predict(X)
+            path[:, col] = out['yhat'][:, col]                # Later steps lag on the point forecast
+
+        out['yhat_lower'] = np.minimum(out['yhat_lower'], out['yhat'])
+        out['yhat_upper'] = np.maximum(out['yhat_upper'], out['yhat'])
+        out['ds'] = all_dates
+        return out
+
+    def evaluate(self, Y, forecast):
+        """Per-series MAE, RMSE and R2 on the observed months."""
+        from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+        metrics = {}
+        for i, name in enumerate(self.series):
+            observed = ~np.isnan(Y[i])
+            y, yhat = Y[i, observed], forecast['yhat'][i, :Y.shape[1]][observed]
+            metrics[name] = {
+                'model': 'LightGBM',
+                'MAE': mean_absolute_error(y, yhat),
+                'RMSE': np.sqrt(mean_squared_error(y, yhat)),
+                'R2': r2_score(y, yhat) if len(y) > 1 else np.nan,
+            }
+        return metrics
+
+    def save_artifacts(self, results, metrics):
+        """Saves the models, and a forecast per series in ProphetTrainer's format."""
+        try:
+            self.logger.info("Saving Model......")
+            model_path = self._artifact_path('lgbm_model', 'LightGBM_model.json')
+            os.makedirs(os.path.dirname(model_path), exist_ok=True)
+            artifact = json.dumps({
+                'series': self.series,
+                'params': self.model_params,
+                'alphas': self.alphas,
+                'models': {name: model.booster_.model_to_string() for name, model in self.models.items()},
+            })
+            self.model_version = hashlib.sha256(artifact.encode()).hexdigest()[:16]
+            with open(model_path, "w") as fout:
+                fout.write(artifact)
+            self.logger.info("Model Saved")
+
+            for name, (_, forecast_future, _) in results.items():
+                forecast_path = resolve_path(self.config.get(f'model_forecast_{name}') or
+                                             os.path.join(self.config.get('model_dir', 'Reports\\models'), f'Model_Forecast_{name}.csv'))
+                pd.DataFrame({
+                    "Date_forecast": forecast_future['ds'],
+                    "Forecast": forecast_future['yhat'],
+                    "Lower Bound": forecast_future['yhat_lower'],
+                    "Upper Bound": forecast_future['yhat_upper'],
+                    "Accuracy": metrics[name]['R2']
+                }).to_csv(forecast_path, index=False)
+            self.logger.info(f"Forecasts saved for {len(results)} series\n")
+
+        except Exception as e:
+            self.logger.error(f"Error saving LightGBM files: {e}", exc_info=True)
+            raise ValueError("Error Occured while Saving File for LightGBM")
+
+    def run(self, series_data):
+        """
+        Trains one model on every series in `series_data` and forecasts them all.
+        Returns:
+            dict: series name -> (prophet_data, forecast_future, prophet_data_pred), as ProphetTrainer.run.
+        """
+        self.series = list(series_data)
+        Y, dates = build_features.series_matrix(build_features.stack_series(series_data), self.series, self.freq)
+        self.train(Y, dates)
+        forecast = self.forecast(Y, dates)
+        self.metrics = self.evaluate(Y, forecast)
+
+        results = {}
+        for i, name in enumerate(self.series):
+            forecast_future = pd.DataFrame({'ds': forecast['ds'], **{col: forecast[col][i] for col in self.models}})
+            forecast_future = forecast_future[~np.isnan(np.append(Y[i], np.zeros(self.horizon)))].reset_index(drop=True)
+            prophet_data = series_data[name][['Date', 'QTY_MT']].rename(columns={'Date': 'ds', 'QTY_MT': 'y'}).reset_index(drop=True)
+            prophet_data_pred = prophet_data[['ds']].merge(forecast_future, on='ds', how='left')
+            results[name] = (prophet_data, forecast_future, prophet_data_pred)
+
+        self.save_artifacts(results, self.metrics)
+        return results
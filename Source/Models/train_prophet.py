@@ -1,21 +1,82 @@
 import pandas as pd 
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime
 import os 
-import re
 import sys
-from prophet import Prophet
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from prophet.serialize import model_to_json
 import json
+import time
+import hashlib
 
 # Adjust path to import custom modules
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..')))
 from Logging.logger import get_logger
+from Source.Models.model_cache import ModelCache
+from Source.Utils.storage import resolve_path
+
+def artifact_path(config, key, series, file_name):
+    """Path configured as `<key>_<series>`, else `<file_name>` under model_dir."""
+    path = config.get(f'{key}_{series}') or os.path.join(config.get('model_dir', 'Reports\\models'), file_name)
+    return resolve_path(path)
+
+
+def fit_stats_path(model_path):
+    """Sidecar of a saved model with its fit statistics and model_version."""
+    return os.path.splitext(model_path)[0] + '_fit.json'
+
+
+def saved_model_version(model_path):
+    """model_version written next to a saved model; the artifact's content hash when the sidecar has none."""
+    sidecar = fit_stats_path(model_path)
+    if os.path.exists(sidecar):
+        with open(sidecar, "r") as f:
+            version = json.load(f).get('model_version')
+        if version:
+            return version
+    with open(model_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def default_prophet_params():
+    """Prophet parameters of series without a tuned configuration."""
+    return {
+        'changepoint_prior_scale': 0.1,
+        'seasonality_mode': 'multiplicative',
+        'seasonality_prior_scale': 10.0,
+        'yearly_seasonality': True,
+        'weekly_seasonality': False,
+        'daily_seasonality': False,
+        'interval_width': 0.80,
+    }
+
+
+def fit_prophet(prophet_data, params, init=None, max_iter=None):
+    """
+    Fits Prophet the way production models are fitted (full optimizer run), so other
+    callers such as the backtest score the same model. `max_iter` caps the optimizer
+    (tuning's pruning stages only).
+    """
+    from prophet import Prophet               # Deferred: prophet/cmdstanpy are slow to import
+
+    model = Prophet(**params)
+    # save_iterations makes CmdStan write one CSV row per optimizer iteration (see optimizer_iterations)
+    kwargs = {'save_iterations': True}
+    if init:
+        kwargs['init'] = init
+    if max_iter:
+        kwargs['iter'] = max_iter
+    model.fit(prophet_data, **kwargs)
+    return model
+
+
+def optimizer_iterations(model):
+    """Iterations the model's fit took, from the CmdStan output CSV (None if unavailable)."""
+    try:
+        saved = model.stan_backend.stan_fit.optimized_iterations_np
+    except Exception:
+        return None
+    # One row for the initial values plus one per iteration
+    return int(saved.shape[0]) - 1 if saved is not None else None
+
 
 class ProphetTrainer:
     def __init__(self, state_name, config_path, model_params=None):
@@ -24,21 +85,28 @@ class ProphetTrainer:
         self.logger = get_logger(f"Prophet_{state_name}")
         self.model_params = model_params or self._get_default_params()
         self.model = None
+        self.model_cache = self._get_model_cache()
+        self.fit_stats = None
+        self.model_version = None
+        self.metrics = None
+        self.horizon = self.config.get('forecast_horizon', 3)
+        self.freq = self.config.get('forecast_freq', 'MS')
 
     def _load_config(self, path):
         with open(path, "r") as f:
             return json.load(f)
 
+    def _get_model_cache(self):
+        if not self.config.get('model_cache', True):
+            return None
+        return ModelCache(
+            resolve_path(self.config.get('model_cache_dir', 'Reports\\models\\cache')),
+            max_entries=self.config.get('model_cache_max_entries', 3),
+            max_age_days=self.config.get('model_cache_max_age_days', 30),
+        )
+
     def _get_default_params(self):
-        return {
-            'changepoint_prior_scale': 0.1,
-            'seasonality_mode': 'multiplicative',
-            'seasonality_prior_scale': 10.0,
-            'yearly_seasonality': True,
-            'weekly_seasonality': False,
-            'daily_seasonality': False,
-            'interval_width': 0.80,
-        }
+        return default_prophet_params()
 
     def prepare_data(self, data):
         """Prepares data for Prophet by renaming columns."""
@@ -51,25 +119,116 @@ class ProphetTrainer:
             raise ValueError(f"Error in Data Preparation Part for {self.state}")
 
     def train(self, prophet_data):
-        """Trains the Prophet model."""
+        """Trains the Prophet model, or reloads it from the model cache when data and params are unchanged."""
         try:
-            self.logger.info("Fitting Data to the Model......")
-            self.model = Prophet(**self.model_params)
-            self.model.fit(prophet_data)
+            fingerprint = None
+            if self.model_cache is not None:
+                fingerprint = self.model_cache.fingerprint(prophet_data, self.model_params)
+                self.model_version = fingerprint[:16]
+                self.model = self.model_cache.get(self.state, fingerprint)
+                if self.model is not None:
+                    self.logger.info("Model loaded from cache, training skipped\n")
+                    return
+
+            init = self._warm_start_params(prophet_data) if self.config.get('warm_start', False) else None
+            self.logger.info(f"Fitting Data to the Model ({'warm start' if init else 'cold start'})......")
+            start = time.perf_counter()
+            try:
+                self.model = fit_prophet(prophet_data, self.model_params, init)
+            except Exception as e:
+                if not init:
+                    raise
+                self.logger.warning(f"Warm start failed ({e}), refitting from scratch")
+                init = None
+                start = time.perf_counter()
+                self.model = fit_prophet(prophet_data, self.model_params)
+            self._record_fit_stats(time.perf_counter() - start, warm_start=init is not None)
             self.logger.info("Model Training Complete\n")
+
+            if fingerprint is not None:
+                self.model_cache.put(self.state, fingerprint, self.model)
         except Exception as e:
             self.logger.error(f"Error training model for {self.state}: {e}", exc_info=True)
             raise ValueError(f"Error in Model training Part for {self.state}")
 
-    def evaluate(self, prophet_data):
-        """Generates forecasts and calculates evaluation metrics."""
+    def _artifact_path(self, key, file_name):
+        return artifact_path(self.config, key, self.state, file_name)
+
+    def _model_path(self):
+        return self._artifact_path('Prophet_model', f'Prophet_model_{self.state}.json')
+
+    def _fit_stats_path(self):
+        return fit_stats_path(self._model_path())
+
+    def _warm_start_params(self, prophet_data):
+        """
+        Initial values for the optimizer taken from the last saved model of this state,
+        or None when there is nothing compatible to start from.
+        """
+        model_path = self._model_path()
+        if not os.path.exists(model_path):
+            return None
         try:
+            from prophet.serialize import model_from_json
+
+            with open(model_path, "r") as fin:
+                previous = model_from_json(fin.read())
+            if previous.mcmc_samples != 0 or previous.seasonality_mode != self.model_params.get('seasonality_mode', 'additive'):
+                return None
+
+            init = {name: previous.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+            init['beta'] = previous.params['beta'][0]
+            # Prophet trims the changepoint count on short histories; match the new fit's delta length
+            n_changepoints = self.model_params.get('n_changepoints', 25)
+            hist_size = int(np.floor(len(prophet_data) * self.model_params.get('changepoint_range', 0.8)))
+            n_changepoints = max(1, min(n_changepoints, hist_size - 1))
+            delta = previous.params['delta'][0][:n_changepoints]
+            init['delta'] = np.pad(delta, (0, n_changepoints - len(delta)))
+            return init
+        except Exception as e:
+            self.logger.warning(f"Cannot warm start from {model_path}: {e}")
+            return None
+
+    def _optimizer_iterations(self):
+        """Iterations the last fit took (None if unavailable)."""
+        return optimizer_iterations(self.model)
+
+    def _record_fit_stats(self, fit_seconds, warm_start):
+        """Logs fit time/iterations and, for warm starts, the saving against the last cold fit."""
+        iterations = self._optimizer_iterations()
+        self.fit_stats = {'fit_seconds': round(fit_seconds, 3), 'iterations': iterations, 'warm_start': warm_start}
+        self.logger.info(f"Fit took {fit_seconds:.2f}s, {iterations} optimizer iterations")
+
+        baseline = None
+        if os.path.exists(self._fit_stats_path()):
+            with open(self._fit_stats_path(), "r") as f:
+                baseline = json.load(f).get('cold_start')
+        if warm_start and baseline:
+            saved_iterations = (baseline['iterations'] - iterations) if (baseline['iterations'] and iterations) else None
+            self.logger.info(f"Warm start saved {baseline['fit_seconds'] - fit_seconds:.2f}s and "
+                             f"{saved_iterations} iterations against the last cold fit")
+        self.fit_stats['cold_start'] = self.fit_stats.copy() if not warm_start else baseline
+
+    def evaluate(self, prophet_data, periods=None, freq=None):
+        """
+        Generates forecasts and calculates evaluation metrics.
+
+        A single predict call covers the history plus `periods` future steps of `freq`
+        (defaults: forecast_horizon / forecast_freq from config); the in-sample
+        predictions are sliced out of it rather than predicted a second time.
+        """
+        try:
+            periods = self.horizon if periods is None else periods
+            freq = freq or self.freq
+
             self.logger.info("Forecasting test and Future Data .........")
-            future = self.model.make_future_dataframe(periods=3, freq='MS')
+            future = self.model.make_future_dataframe(periods=periods, freq=freq)
             forecast_future = self.model.predict(future)
-            prophet_data_pred = self.model.predict(prophet_data)
+            prophet_data_pred = prophet_data[['ds']].merge(forecast_future, on='ds', how='left')
             self.logger.info("Model Forecasting Complete\n")
 
+            from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
             self.logger.info("Calculating MAE, RMSE and Accuracy for Test....")
             MAE = mean_absolute_error(prophet_data['y'], prophet_data_pred['yhat'])
             RMSE = np.sqrt(mean_squared_error(prophet_data['y'], prophet_data_pred['yhat']))
@@ -83,46 +242,41 @@ class ProphetTrainer:
             self.logger.error(f"Error during model prediction for {self.state}: {e}", exc_info=True)
             raise ValueError(f"Error in Model prediction Part for {self.state}")
 
-    def save_artifacts(self, prophet_data_pred, MAE, RMSE, accuracy):
-        """Saves model, report, and forecast data."""
+    def save_artifacts(self, forecast_future, accuracy):
+        """Saves model and forecast data (history and future months); metrics go to the metrics store."""
         try:
+            from prophet.serialize import model_to_json
+
             self.logger.info("Saving Model......")
             
             # Save Model
-            model_path_key = f'Prophet_model_{self.state}'
-            if model_path_key in self.config:
-                with open(self.config[model_path_key], "w") as fout:
-                    fout.write(model_to_json(self.model))
-                self.logger.info("Model Saved")
-            else:
-                self.logger.warning(f"Config key '{model_path_key}' not found. Model not saved.")
-
-            # Save Metrics Report
-            report_key = f'model_evaluation_{self.state}'
-            if report_key in self.config:
-                timestamp = pd.Timestamp.now().strftime("%Y-%m-%d_%H-%M-%S")
-                save_model_performance = pd.DataFrame({
-                    'Date': [timestamp],
-                    'Model': [f'Prophet_{self.state}'],
-                    'MAE': [MAE],
-                    'RMSE': [RMSE]
-                })
-                header = not pd.io.common.file_exists(self.config[report_key])
-                save_model_performance.to_csv(self.config[report_key], mode='a', index=False, header=header)
-                self.logger.info('Model Report Generated\n')
+            model_path = self._model_path()
+            os.makedirs(os.path.dirname(model_path), exist_ok=True)
+            serialized = model_to_json(self.model)
+            with open(model_path, "w") as fout:
+                fout.write(serialized)
+            if self.model_version is None:
+                # No cache fingerprint (model_cache off): version the forecast by the artifact itself
+                self.model_version = hashlib.sha256(serialized.encode()).hexdigest()[:16]
+            # The sidecar always carries model_version so serving reports the same one as the forecast table
+            fit_stats = self.fit_stats
+            if not fit_stats and os.path.exists(self._fit_stats_path()):
+                with open(self._fit_stats_path(), "r") as f:
+                    fit_stats = json.load(f)
+            with open(self._fit_stats_path(), "w") as fout:
+                json.dump({**(fit_stats or {}), 'model_version': self.model_version}, fout, indent=4)
+            self.logger.info("Model Saved")
 
             # Save Forecast
-            forecast_key = f'model_forecast_{self.state}'
-            if forecast_key in self.config:
-                save_forecast = pd.DataFrame({
-                    "Date_forecast": prophet_data_pred['ds'],
-                    "Forecast": prophet_data_pred['yhat'],
-                    "Lower Bound": prophet_data_pred['yhat_lower'],
-                    "Upper Bound": prophet_data_pred['yhat_upper'],
-                    "Accuracy": accuracy
-                })
-                save_forecast.to_csv(self.config[forecast_key], index=False)
-                self.logger.info("Forecast Data Saved\n")
+            save_forecast = pd.DataFrame({
+                "Date_forecast": forecast_future['ds'],
+                "Forecast": forecast_future['yhat'],
+                "Lower Bound": forecast_future['yhat_lower'],
+                "Upper Bound": forecast_future['yhat_upper'],
+                "Accuracy": accuracy
+            })
+            save_forecast.to_csv(self._artifact_path('model_forecast', f'Model_Forecast_{self.state}.csv'), index=False)
+            self.logger.info("Forecast Data Saved\n")
 
         except Exception as e:
             self.logger.error(f"Error saving files for {self.state}: {e}", exc_info=True)
@@ -133,7 +287,8 @@ class ProphetTrainer:
         prophet_data = self.prepare_data(data)
         self.train(prophet_data)
         forecast_future, prophet_data_pred, MAE, RMSE, accuracy = self.evaluate(prophet_data)
-        self.save_artifacts(prophet_data_pred, MAE, RMSE, accuracy)
+        self.save_artifacts(forecast_future, accuracy)
+        self.metrics = {'model': 'Prophet', 'MAE': MAE, 'RMSE': RMSE, 'R2': accuracy}
         
         return prophet_data, forecast_future, prophet_data_pred
 
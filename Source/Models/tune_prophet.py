@@ -0,0 +1,175 @@
+import pandas as pd 
+import numpy as np
+import os 
+import sys
+import json
+import logging
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+# Adjust path to import custom modules
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..')))
+from Logging.logger import get_logger
+from Source.Utils.helpers import rolling_origin_splits
+from Source.Utils.storage import resolve_path
+from Source.Models.train_prophet import fit_prophet, optimizer_iterations
+
+
+def evaluate_candidate(prophet_data, params, folds, fold_ids, max_iter=None):
+    """
+    Fits one parameter set on the given folds and returns {fold_id: (RMSE, converged)}. Runs in a worker process.
+    `max_iter` caps the Stan optimizer so a non-converging configuration costs seconds, not minutes;
+    None runs it to convergence. A capped fit that stopped before the cap is the converged fit.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    errors = {}
+    for fold_id in fold_ids:
+        train_end, test_end = folds[fold_id]
+        model = fit_prophet(prophet_data.iloc[:train_end], params, max_iter=max_iter)
+        iterations = optimizer_iterations(model)
+        converged = max_iter is None or (iterations is not None and iterations < max_iter)
+        test = prophet_data.iloc[train_end:test_end]
+        forecast = model.predict(test[['ds']])
+        errors[fold_id] = (float(np.sqrt(np.mean((test['y'].to_numpy() - forecast['yhat'].to_numpy()) ** 2))), converged)
+    return errors
+
+
+class ProphetTuner:
+    """
+    Searches changepoint_prior_scale, seasonality_prior_scale and seasonality_mode per state
+    with rolling-origin cross-validation.
+
+    Fold splits are computed once per state and shared by every candidate. Folds are
+    evaluated in pruning stages with the optimizer capped at `tuning_max_iter`: after each
+    stage, candidates whose mean RMSE is worse than `tuning_prune_factor` x the best are
+    dropped, so bad configurations never see the later folds. The survivors are then fitted
+    uncapped on the remaining folds; pruning fits that converged before the cap are the same
+    fits and are reused, so a (candidate, fold) is only fitted twice when the cap cut it short.
+    """
+
+    def __init__(self, config_path, base_params=None):
+        self.config = self._load_config(config_path)
+        self.logger = get_logger("Prophet-Tuning")
+        self.base_params = base_params or {}
+        self.param_grid = self.config.get('tuning_grid', {
+            'changepoint_prior_scale': [0.01, 0.05, 0.1, 0.5],
+            'seasonality_prior_scale': [1.0, 10.0],
+            'seasonality_mode': ['additive', 'multiplicative'],
+        })
+        self.initial = self.config.get('tuning_initial', 36)
+        self.horizon = self.config.get('forecast_horizon', 3)
+        self.period = self.config.get('tuning_period', 3)
+        self.stages = self.config.get('tuning_stages', 3)
+        self.prune_factor = self.config.get('tuning_prune_factor', 1.5)
+        self.max_iter = self.config.get('tuning_max_iter', 1000)
+        self.max_workers = self.config.get('parallel_workers', 1)
+        self.output_path = resolve_path(self.config.get('state_model_configs', 'Source\\state_model_configs.json'))
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _candidates(self, state_name):
+        base = self.base_params.get(state_name, {})
+        names = list(self.param_grid)
+        return [{**base, **dict(zip(names, values))} for values in itertools.product(*self.param_grid.values())]
+
+    def _evaluate(self, state_name, prophet_data, candidates, jobs, folds, max_iter, executor):
+        """
+        Runs every candidate of `jobs` ({candidate: fold_ids}) in parallel; returns
+        {candidate: {fold_id: (RMSE, converged)}} (None when it failed).
+        """
+        futures = {
+            i: executor.submit(evaluate_candidate, prophet_data, candidates[i], folds, fold_ids, max_iter)
+            for i, fold_ids in jobs.items()
+        }
+        errors = {}
+        for i, future in futures.items():
+            try:
+                errors[i] = future.result()
+            except Exception as e:
+                self.logger.warning(f"{state_name}: candidate {candidates[i]} failed: {e}")
+                errors[i] = None
+        return errors
+
+    def tune_state(self, state_name, data, executor):
+        """Returns (best_params, results) for one state; results has one row per candidate."""
+        prophet_data = data[['Date', 'QTY_MT']].rename(columns={'Date': 'ds', 'QTY_MT': 'y'}).reset_index(drop=True)
+        folds = rolling_origin_splits(len(prophet_data), self.initial, self.horizon, self.period)
+        if not folds:
+            raise ValueError(f"{state_name}: {len(prophet_data)} months is too short for initial={self.initial}")
+
+        candidates = self._candidates(state_name)
+        scored = {i: {} for i in range(len(candidates))}
+        alive = list(scored)
+        self.logger.info(f"{state_name}: {len(candidates)} candidates, {len(folds)} folds")
+
+        # Every stage but the last prunes on capped fits; the last stage is the final uncapped scoring
+        stages = np.array_split(np.arange(len(folds)), min(self.stages, len(folds)))[:-1]
+        for stage, fold_ids in enumerate(stages):
+            stage_errors = self._evaluate(state_name, prophet_data, candidates, {i: fold_ids.tolist() for i in alive},
+                                          folds, self.max_iter, executor)
+            for i, fold_errors in stage_errors.items():
+                if fold_errors is None:
+                    scored[i] = None
+                else:
+                    scored[i].update(fold_errors)
+
+            scores = {i: np.mean([rmse for rmse, _ in scored[i].values()]) for i in alive if scored[i]}
+            if not scores:
+                raise ValueError(f"Every candidate failed for {state_name}")
+            best = min(scores.values())
+            alive = [i for i, score in scores.items() if score <= self.prune_factor * best]
+            self.logger.info(f"{state_name} stage {stage + 1}: best RMSE {best:.2f}, {len(alive)} candidates kept")
+
+        # Survivors only fit the folds without a converged score: the last stage and any capped fits
+        remaining = {i: [fold_id for fold_id in range(len(folds)) if not scored[i].get(fold_id, (None, False))[1]]
+                     for i in alive}
+        final_errors = self._evaluate(state_name, prophet_data, candidates, {i: ids for i, ids in remaining.items() if ids},
+                                      folds, None, executor)
+        for i, fold_errors in final_errors.items():
+            scored[i] = None if fold_errors is None else {**scored[i], **fold_errors}
+        self.logger.info(f"{state_name}: final scoring of {len(alive)} candidates needed "
+                         f"{sum(map(len, remaining.values()))} uncapped fits")
+
+        final = {i: scored[i] for i in alive}
+        results = pd.DataFrame([
+            {**candidates[i], 'folds': len(final[i]) if final.get(i) else 0,
+             'cv_rmse': np.mean([rmse for rmse, _ in final[i].values()]) if final.get(i) else np.nan}
+            for i in scored
+        ])
+        # Only candidates scored on every fold with converged fits can win
+        finished = results[results['folds'] == len(folds)]
+        if finished.empty:
+            raise ValueError(f"Every candidate failed for {state_name}")
+        best_params = candidates[finished['cv_rmse'].idxmin()]
+        self.logger.info(f"{state_name}: best {best_params} (CV RMSE {finished['cv_rmse'].min():.2f})\n")
+        return best_params, results
+
+    def run(self, state_data):
+        """Tunes every state in `state_data` and writes the winners to state_model_configs."""
+        tuned = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for state_name, data in state_data.items():
+                try:
+                    tuned[state_name], _ = self.tune_state(state_name, data, executor)
+                except Exception as e:
+                    self.logger.error(f"Error tuning {state_name}: {e}", exc_info=True)
+
+        if not tuned:
+            self.logger.warning(f"No state was tuned, {self.output_path} left unchanged")
+            return tuned
+
+        # States not tuned in this run keep their earlier configs
+        configs = {}
+        if os.path.exists(self.output_path):
+            with open(self.output_path, "r") as f:
+                configs = json.load(f)
+        configs.update(tuned)
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        with open(self.output_path, "w") as f:
+            json.dump(configs, f, indent=4)
+        self.logger.info(f"Tuned configs for {len(tuned)} states written to {self.output_path}")
+        return tuned
@@ -0,0 +1,204 @@
+import pandas as pd
+import os
+import sys
+import re
+import json
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Logging.logger import get_logger
+from Source.Models.train_prophet import artifact_path, saved_model_version
+from Source.Models.forecast_store import ForecastStore
+from Source.Utils.storage import resolve_path
+
+# Serves forecasts from the Prophet models the pipeline writes to Reports/models.
+# Run with:  uvicorn --factory Source.Serving.app:create_app   (or python Source/Serving/app.py)
+# Importing this module has no side effects; the app and its stores are built by create_app.
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config.json'))
+# Series names come from Utils.series.series_name; anything else could point outside model_dir
+SERIES_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class ModelRegistry:
+    """
+    Size-bounded LRU cache of deserialized ProphetTrainer models.
+
+    Each entry remembers the artifact's mtime and size; a lookup only stats the file and
+    reloads it when either changed. Responses report the model_version saved with the
+    artifact (as in the forecast table), not the file stamp. Future predictions are kept per entry for the
+    largest horizon asked so far, already as response records; shorter horizons are slices of it.
+    """
+
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.config = self._load_config(config_path)
+        self.max_models = self.config.get('serving_cache_size', 32)
+        self.freq = self.config.get('forecast_freq', 'MS')
+        self.logger = get_logger("Serving-Registry")
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _load_config(self, path):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def model_path(self, series):
+        if not SERIES_PATTERN.match(series):
+            raise KeyError(series)
+        return artifact_path(self.config, 'Prophet_model', series, f'Prophet_model_{series}.json')
+
+    def available_series(self):
+        """Series with a saved model: configured Prophet_model_<series> keys plus files under model_dir."""
+        prefix = 'Prophet_model_'
+        series = {key[len(prefix):] for key in self.config if key.startswith(prefix)}
+        configured = {self.model_path(name) for name in series if SERIES_PATTERN.match(name)}
+        model_dir = resolve_path(self.config.get('model_dir', 'Reports\\models'))
+        if os.path.isdir(model_dir):
+            for name in os.listdir(model_dir):
+                path = os.path.join(model_dir, name)
+                if name.startswith(prefix) and name.endswith('.json') and not name.endswith('_fit.json') and path not in configured:
+                    series.add(name[len(prefix):-len('.json')])
+        series = {name for name in series if SERIES_PATTERN.match(name)}
+        return sorted(name for name in series if os.path.exists(self.model_path(name)))
+
+    def _load(self, series, path, stamp):
+        from prophet.serialize import model_from_json
+
+        with open(path, "r") as fin:
+            model = model_from_json(fin.read())
+        model_version = saved_model_version(path)
+        self.logger.info(f"Loaded model {model_version} for {series} from {path}")
+        return {'model': model, 'stamp': stamp, 'model_version': model_version, 'forecast': None, 'lock': threading.Lock()}
+
+    def cached_series(self):
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, series):
+        """Returns the cache entry for `series`, (re)loading it when its artifact changed; KeyError if unknown."""
+        path = self.model_path(series)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise KeyError(series)
+        stamp = (stat.st_mtime_ns, stat.st_size)        # Only detects a changed artifact
+
+        with self._lock:
+            entry = self._entries.get(series)
+            if entry is None or entry['stamp'] != stamp:
+                entry = self._load(series, path, stamp)
+                self._entries[series] = entry
+            self._entries.move_to_end(series)
+            while len(self._entries) > self.max_models:
+                evicted, _ = self._entries.popitem(last=False)
+                self.logger.info(f"Evicted {evicted} from the model cache")
+        return entry
+
+    def forecast(self, series, horizon):
+        """Future forecast for the next `horizon` periods, computed once per model version."""
+        entry = self.get(series)
+        with entry['lock']:
+            cached = entry['forecast']
+            if cached is None or len(cached) < horizon:
+                model = entry['model']
+                future = model.make_future_dataframe(periods=horizon, freq=self.freq, include_history=False)
+                entry['forecast'] = cached = _records(model.predict(future))
+        return cached[:horizon], entry['model_version']
+
+    def predict(self, series, dates):
+        """On-demand prediction for arbitrary dates (not cached)."""
+        model = self.get(series)['model']
+        return _records(model.predict(pd.DataFrame({'ds': pd.to_datetime(dates)})))
+
+
+def _records(forecast):
+    forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].assign(ds=forecast['ds'].dt.strftime('%Y-%m-%d'))
+    return forecast.round(4).to_dict(orient='records')
+
+
+class PredictRequest(BaseModel):
+    series: str
+    dates: List[str]
+
+
+class SeriesRange(BaseModel):
+    series: str
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+
+class ForecastQuery(BaseModel):
+    queries: List[SeriesRange]
+    future_only: bool = False
+
+
+def _table_records(rows):
+    rows = rows.assign(ds=rows['ds'].dt.strftime('%Y-%m-%d')).astype(object)
+    return rows.where(rows.notna(), None).to_dict(orient='records')
+
+
+def create_app(config_path=CONFIG_PATH):
+    registry = ModelRegistry(config_path)
+    stores = {}
+    store_lock = threading.Lock()
+    max_horizon = registry.config.get('serving_max_horizon', 24)
+    app = FastAPI(title="Mahalaabh SCM Forecasts")
+    app.state.registry = registry
+
+    def forecast_store():
+        # Opened on first use, so building the app does not create the forecast database
+        with store_lock:
+            if 'forecasts' not in stores:
+                stores['forecasts'] = ForecastStore(config_path)
+            return stores['forecasts']
+
+    @app.get("/health")
+    def health():
+        return {'status': 'ok', 'cached_models': registry.cached_series()}
+
+    @app.get("/series")
+    def series():
+        return {'series': registry.available_series()}
+
+    @app.get("/forecast/{series}")
+    def forecast(series: str, horizon: int = Query(registry.config.get('forecast_horizon', 3), ge=1, le=max_horizon)):
+        try:
+            result, version = registry.forecast(series, horizon)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"No model for series '{series}'")
+        return {'series': series, 'horizon': horizon, 'model_version': version, 'forecast': result}
+
+    @app.post("/predict")
+    def predict(request: PredictRequest):
+        try:
+            result = registry.predict(request.series, request.dates)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"No model for series '{request.series}'")
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return {'series': request.series, 'forecast': result}
+
+    @app.post("/forecasts/query")
+    def forecasts_query(request: ForecastQuery):
+        """Precomputed history + horizon rows for many series / date ranges in one indexed read."""
+        try:
+            rows = forecast_store().query([query.model_dump() for query in request.queries], request.future_only)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return {'rows': _table_records(rows)}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    app = create_app()
+    config = app.state.registry.config
+    uvicorn.run(app, host=config.get('serving_host', '127.0.0.1'), port=config.get('serving_port', 8000))
@@ -1,8 +1,8 @@
 import pandas as pd 
 import numpy as np
-import matplotlib.pyplot as plt
 import os
-import seaborn as sns
+import sys
+import subprocess
 
 # This module contains utility functions for the Project.
 
@@ -28,4 +28,117 @@ def load_data(file_data):
     else:
         raise ValueError("Unsupported file format. Please provide a CSV or Excel file.")
     
-    return data
\ No newline at end of file
+    return data
+
+
+# Calendar labels used across the project (Month names follow the sales reports).
+MONTH_LABELS = np.array(["Jan", "Feb", "March", "April", "May", "June",
+                         "July", "Aug", "Sep", "Oct", "Nov", "Dec"], dtype=object)
+KHARIF_MONTHS = (4, 9)                                   # April to September, both inclusive
+
+
+def add_calendar_features(df, date_col):
+    """
+    Adds FY, Season, Month, Num_Month and Year columns derived from a datetime64 column.
+
+    Everything is computed with NumPy arithmetic on the datetime64 values and written
+    straight into `df`, so no intermediate copies of the frame are made.
+
+    Parameters:
+    df (pd.DataFrame): Frame to extend in place.
+    date_col (str): Name of the datetime64 column.
+
+    Returns:
+    pd.DataFrame: The same frame, for chaining.
+    """
+    dates = df[date_col].to_numpy()
+    valid = ~np.isnat(dates)
+
+    years = dates.astype('datetime64[Y]').astype(np.int64)
+    num_month = dates.astype('datetime64[M]').astype(np.int64) - years * 12 + 1
+    year = years + 1970
+
+    # Jan, Feb, Mar belong to the previous FY, Apr-Dec to the current one -> 'YY-YY'
+    fy_start = year - (num_month < 4)
+    fy_values, fy_codes = np.unique(fy_start[valid], return_inverse=True)
+    fy_labels = np.array([f"{y % 100:02d}-{(y + 1) % 100:02d}" for y in fy_values], dtype=object)
+
+    month = np.full(len(dates), np.nan, dtype=object)
+    season = np.full(len(dates), np.nan, dtype=object)
+    fy = np.full(len(dates), np.nan, dtype=object)
+    month[valid] = MONTH_LABELS[num_month[valid] - 1]
+    kharif = (num_month >= KHARIF_MONTHS[0]) & (num_month <= KHARIF_MONTHS[1])
+    season[valid] = np.where(kharif[valid], "Kharif", "Rabi")
+    fy[valid] = fy_labels[fy_codes.ravel()]
+
+    df['Month'] = month
+    df['Season'] = season
+    df['FY'] = fy
+    if valid.all():
+        df['Num_Month'] = num_month.astype(np.int32)
+        df['Year'] = year.astype(np.int32)
+    else:
+        df['Num_Month'] = np.where(valid, num_month, np.nan)
+        df['Year'] = np.where(valid, year, np.nan)
+
+    return df
+
+
+
+# Libraries that only the training / reporting stages need
+HEAVY_MODULES = ('prophet', 'cmdstanpy', 'sklearn', 'plotly', 'matplotlib', 'seaborn', 'lightgbm')
+
+
+def check_import_budget(module, budget_seconds=1.0):
+    """
+    Imports a module in a fresh interpreter (python -X importtime) and checks it against a time budget.
+
+    Parameters:
+    module (str): Dotted module name, importable from the project root (e.g. 'Source.Data.load_data').
+    budget_seconds (float): Allowed cumulative import time.
+
+    Returns:
+    dict: seconds, heavy modules that got imported and whether the import stayed within budget.
+    """
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=project_root)
+    if result.returncode != 0:
+        raise ImportError(f"Cannot import {module}: {result.stderr.strip().splitlines()[-1]}")
+
+    total_us, loaded = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        if not cumulative.strip().isdigit():                 # header line
+            continue
+        loaded.add(name.strip().split('.')[0])
+        if not name[1:].startswith(' '):                    # top-level import, not a nested one
+            total_us += int(cumulative)
+
+    seconds = total_us / 1e6
+    return {
+        'module': module,
+        'seconds': round(seconds, 3),
+        'heavy_modules': sorted(loaded.intersection(HEAVY_MODULES)),
+        'within_budget': seconds <= budget_seconds,
+    }
+
+
+
+def rolling_origin_splits(n_rows, initial, horizon, period=1):
+    """
+    Expanding-window (rolling-origin) splits over a time-ordered series.
+
+    Parameters:
+    n_rows (int): Length of the series.
+    initial (int): Rows in the first training window.
+    horizon (int): Rows forecast after each cutoff.
+    period (int): Rows the cutoff moves forward between folds.
+
+    Returns:
+    list: (train_end, test_end) positions; fold i trains on [0, train_end) and tests on [train_end, test_end).
+    """
+    return [(train_end, train_end + horizon)
+            for train_end in range(initial, n_rows - horizon + 1, period)]
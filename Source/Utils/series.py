@@ -0,0 +1,204 @@
+import os
+import re
+import sys
+import time
+import hashlib
+from collections import Counter
+import multiprocessing
+from multiprocessing import connection
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Logging.logger import get_logger
+
+# Series partitioning and the worker pool that forecasts every series.
+
+logger = get_logger("Series-Scheduler")
+
+# Names the artifact keys in config.json were created with
+SERIES_ALIASES = {
+    'Chhattisgarh': 'Chattisgarh',
+}
+
+
+def series_name(values):
+    """
+    Filesystem-safe series name from its key values, e.g. ('Tamil Nadu',) -> 'TamilNadu'
+    and ('Gujarat', 'Mahalaabh Gr.') -> 'Gujarat_MahalaabhGr'.
+    """
+    parts = [re.sub(r'[^\w-]', '', str(SERIES_ALIASES.get(value, value))) for value in values]
+    return '_'.join(parts)
+
+
+def series_names(keys):
+    """
+    series_name of every key tuple in `keys`. Keys that would share a name (e.g. districts
+    differing only in punctuation or spacing) each get a short hash of their values appended,
+    so no series silently replaces another.
+    """
+    keys = [tuple(values) for values in keys]
+    names = [series_name(values) for values in keys]
+    collided = {name for name, count in Counter(names).items() if count > 1}
+    if not collided:
+        return names
+
+    logger.warning(f"Series names shared by several keys, hash suffix added: {sorted(collided)[:20]}")
+    names = [
+        f"{name}_{hashlib.sha1(repr(values).encode()).hexdigest()[:8]}" if name in collided else name
+        for name, values in zip(names, keys)
+    ]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Could not build unique series names for {sorted(collided)}")
+    return names
+
+
+def partition_series(df, keys, min_length=2):
+    """
+    Splits the monthly data into one frame per combination of `keys` in a single groupby.
+
+    Parameters:
+    df (pd.DataFrame): Monthly aggregated data with a Date column and the key columns.
+    keys (list): Columns identifying a series, e.g. ['State'] or ['State', 'District'].
+    min_length (int): Series with fewer months are skipped.
+
+    Returns:
+    dict: series name -> date-ordered frame.
+    """
+    series, skipped = {}, []
+    groups = list(df.groupby(keys, sort=True, dropna=True))
+    names = series_names(values for values, _ in groups)
+    for name, (_, frame) in zip(names, groups):
+        if len(frame) < min_length:
+            skipped.append(name)
+            continue
+        series[name] = frame.sort_values('Date').reset_index(drop=True)
+
+    logger.info(f"Discovered {len(series)} series by {keys}")
+    if skipped:
+        logger.warning(f"{len(skipped)} series shorter than {min_length} months skipped: {skipped[:20]}")
+    return series
+
+
+def _series_worker(job, tasks, results):
+    """
+    Worker loop: runs job(name, *args) for each task it is handed until it receives None.
+    Results go back on this worker's own pipe, so terminating it cannot corrupt another worker's channel.
+    """
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        name, args = task
+        try:
+            output = job(name, *args)
+            results.send((name, None, output))
+        except Exception as e:
+            results.send((name, f"{type(e).__name__}: {e}", None))
+
+
+class SeriesScheduler:
+    """
+    Runs one job per series on at most `max_workers` long-lived worker processes.
+
+    Each worker is handed one series at a time and answers on its own result pipe, so
+    the scheduler always knows what a worker is running: a series running longer than
+    `timeout` seconds, or whose worker dies, is marked failed and the worker is replaced.
+    Whatever a successful job returns (it must be picklable) is collected in `outputs`.
+    With max_workers=1 the jobs run one after another in this process (no timeout).
+    """
+
+    def __init__(self, job, max_workers=1, timeout=None):
+        self.job = job
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.outputs = {}
+        self.logger = logger
+
+    def _finish(self, errors, total, name, error):
+        errors[name] = error
+        if error:
+            self.logger.error(f"Error processing {name}: {error}")
+        else:
+            self.logger.info(f"{name} Completed ({len(errors)}/{total})")
+
+    def _run_sequential(self, jobs):
+        errors = {}
+        self.logger.info(f"Processing {len(jobs)} series sequentially......")
+        for name, args in jobs.items():
+            try:
+                self.outputs[name] = self.job(name, *args)
+                self._finish(errors, len(jobs), name, None)
+            except Exception as e:
+                self._finish(errors, len(jobs), name, f"{type(e).__name__}: {e}")
+        return errors
+
+    def _spawn(self, ctx):
+        tasks = ctx.SimpleQueue()
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_series_worker, args=(self.job, tasks, sender), daemon=True)
+        process.start()
+        sender.close()                              # Only the worker writes; EOF then means it died
+        return {'process': process, 'tasks': tasks, 'results': receiver, 'series': None, 'started': None}
+
+    def _retire(self, worker):
+        worker['process'].join(timeout=10)
+        worker['results'].close()
+
+    def run(self, jobs):
+        """
+        Runs every job in `jobs` ({series name: args tuple}).
+        Returns:
+            dict: series name -> None on success, else the error message.
+        """
+        if not jobs:
+            return {}
+        if self.max_workers == 1:
+            return self._run_sequential(jobs)
+
+        ctx = multiprocessing.get_context()
+        pending = list(jobs.items())[::-1]
+        workers = [self._spawn(ctx) for _ in range(min(self.max_workers, len(jobs)))]
+        errors = {}
+        self.logger.info(f"Processing {len(jobs)} series with {len(workers)} workers......")
+
+        while len(errors) < len(jobs):
+            for worker in workers:
+                if worker['series'] is None and pending:
+                    name, args = pending.pop()
+                    worker['tasks'].put((name, args))
+                    worker['series'], worker['started'] = name, time.monotonic()
+
+            busy = {worker['results']: worker for worker in workers if worker['series'] is not None}
+            for conn in connection.wait(list(busy), timeout=1):
+                worker = busy[conn]
+                try:
+                    name, error, output = conn.recv()
+                except (EOFError, OSError):
+                    worker['process'].join(timeout=1)   # Died mid-job; handled below
+                    continue
+                worker['series'] = None
+                if error is None:
+                    self.outputs[name] = output
+                self._finish(errors, len(jobs), name, error)
+
+            now = time.monotonic()
+            for i, worker in enumerate(workers):
+                name = worker['series']
+                if name is None:
+                    continue
+                if self.timeout and now - worker['started'] > self.timeout:
+                    worker['process'].terminate()
+                    self._finish(errors, len(jobs), name, f"Timed out after {self.timeout}s")
+                elif not worker['process'].is_alive():
+                    self._finish(errors, len(jobs), name, f"Worker exited with code {worker['process'].exitcode}")
+                else:
+                    continue
+                self._retire(worker)
+                workers[i] = self._spawn(ctx)
+
+        for worker in workers:
+            worker['tasks'].put(None)
+        for worker in workers:
+            worker['process'].join(timeout=10)
+            if worker['process'].is_alive():
+                worker['process'].terminate()
+            worker['results'].close()
+        return errors
@@ -0,0 +1,94 @@
+import pandas as pd 
+import os
+import re
+import shutil
+
+# This module stores processed datasets for the Project.
+# Parquet keeps dtypes, compresses well and supports column/partition pruning on read;
+# CSV stays available as an export for people opening the files by hand.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def resolve_path(path):
+    """Resolves a config path (written with Windows separators) against the project root."""
+    normalized = re.sub(r'[\\/]+', lambda _: os.sep, path)
+    return normalized if os.path.isabs(normalized) else os.path.join(PROJECT_ROOT, normalized)
+
+
+def dataset_path(name, config):
+    """Location of a dataset in the configured storage directory."""
+    storage_format = config.get('storage_format', 'parquet')
+    storage_dir = resolve_path(config.get('storage_dir', 'Data\\Processed'))
+    return os.path.join(storage_dir, f"{name}.{storage_format}")
+
+
+def save_dataset(df, name, config, partition_cols=None, csv_path=None):
+    """
+    Saves a processed dataset with the configured storage backend.
+
+    Parameters:
+    df (pd.DataFrame): Dataset to store.
+    name (str): Dataset name, used as the file (or partition directory) name.
+    config (dict): Project config; reads storage_format, storage_dir,
+        storage_compression and storage_export_csv.
+    partition_cols (list): Columns to partition a Parquet dataset by (e.g. State, FY).
+    csv_path (str): Where the CSV export goes when storage_export_csv is on.
+
+    Returns:
+    str: Path of the stored dataset.
+    """
+    path = dataset_path(name, config)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if config.get('storage_format', 'parquet') == 'parquet':
+        partition_cols = [col for col in (partition_cols or []) if col in df.columns] or None
+        # A partitioned dataset is a directory; clear it so old partitions don't linger
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        df.to_parquet(path, engine='pyarrow', index=False,
+                      compression=config.get('storage_compression', 'snappy'),
+                      partition_cols=partition_cols)
+    else:
+        df.to_csv(path, index=False)
+
+    if csv_path and config.get('storage_export_csv', True):
+        csv_path = resolve_path(csv_path)
+        if os.path.abspath(csv_path) != os.path.abspath(path):
+            os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+            df.to_csv(csv_path, index=False)
+
+    return path
+
+
+def load_dataset(name, config, columns=None, filters=None):
+    """
+    Loads a dataset written by save_dataset.
+
+    Parameters:
+    name (str): Dataset name.
+    config (dict): Project config.
+    columns (list): Only read these columns.
+    filters (list): Parquet row filters, e.g. [('State', '==', 'Gujarat')].
+
+    Returns:
+    pd.DataFrame: The stored dataset.
+    """
+    path = dataset_path(name, config)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The dataset {path} does not exist.")
+
+    if config.get('storage_format', 'parquet') != 'parquet':
+        df = pd.read_csv(path, usecols=columns)
+        for col, op, value in filters or []:
+            if op not in ('==', '=', 'in'):
+                raise ValueError(f"Unsupported filter for CSV storage: {op}")
+            df = df[df[col].isin(value if op == 'in' else [value])]
+        return df
+
+    df = pd.read_parquet(path, engine='pyarrow', columns=columns, filters=filters)
+    # Partition keys come back as categoricals; restore the plain dtype they were written with
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return df
@@ -1,8 +1,8 @@
 import json
-import pandas as pd 
-import numpy as np 
 import sys 
 import os 
+import argparse
+import pandas as pd
 
 # Adjust paths
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -13,7 +13,24 @@ from Logging.logger import get_logger
 from Source.Data.load_data import DataLoader
 from Source.Data.clean_data import DataCleaner
 from Source.Models.train_prophet import ProphetTrainer
-from Source.Evalution.evalution import interactive_evalution
+from Source.Evalution.evalution import interactive_evalution, render_reports
+from Source.Utils.helpers import check_import_budget
+from Source.Utils.storage import resolve_path
+from Source.Utils.series import SeriesScheduler
+from Source.Models.forecast_store import ForecastStore, forecast_rows
+from Source.Evalution.metrics_store import MetricsStore
+
+def run_state_job(state_name, config_path, model_params, data):
+    """
+    Trains and evaluates one series and returns its forecast table rows and metrics.
+    Module level so worker processes can pickle it.
+    """
+    trainer = ProphetTrainer(state_name, config_path, model_params)
+    prophet_data, forecast_future, prophet_data_pred = trainer.run(data)
+    interactive_evalution(prophet_data, forecast_future, prophet_data_pred, state_name, trainer.horizon)
+    return {'forecast': forecast_rows(prophet_data, forecast_future, 'Prophet', trainer.model_version),
+            'metrics': trainer.metrics}
+
 
 class SCMPipeline:
     def __init__(self):
@@ -28,8 +45,8 @@ class SCMPipeline:
             return json.load(f)
 
     def _get_state_model_configs(self):
-        """Returns the configuration for Prophet Model for each state."""
-        return {
+        """Returns the configuration for Prophet Model for each state, overlaid with tuned values if present."""
+        state_model_configs = {
             'Gujarat': {
                 'changepoint_prior_scale': 0.1,
                 'seasonality_mode': 'multiplicative',
@@ -68,48 +85,151 @@ class SCMPipeline:
             }
         }
 
-    def process_state(self, state_name, data):
-        """Train model and evaluate for a specific state."""
-        self.logger.info(f"{state_name} Started......")
+        tuned_path = resolve_path(self.config.get('state_model_configs', 'Source\\state_model_configs.json'))
+        if os.path.exists(tuned_path):
+            with open(tuned_path, "r") as f:
+                for state_name, params in json.load(f).items():
+                    state_model_configs.setdefault(state_name, {}).update(params)
+            self.logger.info(f"Loaded tuned model configs from {tuned_path}")
+        return state_model_configs
+
+    def _get_model_params(self, state_name):
+        model_params = self.state_model_configs.get(state_name)
+        if not model_params:
+            self.logger.warning(f"No specific config found for {state_name}, using defaults in Trainer.")
+        return model_params
+
+    def process_series(self, series_data):
+        """
+        Forecasts every series on the bounded worker pool.
+        Returns:
+            tuple: ({series: error or None}, {series: {'forecast': table rows, 'metrics': dict}}).
+        """
+        scheduler = SeriesScheduler(
+            run_state_job,
+            max_workers=self.config.get('parallel_workers', 1),
+            timeout=self.config.get('series_timeout_seconds'),
+        )
+        jobs = {name: (self.config_path, self._get_model_params(name), data) for name, data in series_data.items()}
+        errors = scheduler.run(jobs)
+        return errors, scheduler.outputs
+
+    def process_series_global(self, series_data):
+        """Forecasts every series with one global LightGBM model and plots each of them; returns as process_series."""
+        from Source.Models.train_lgbm import LGBMTrainer
+
+        trainer = LGBMTrainer(self.config_path)
+        results = trainer.run(series_data)
+        outputs = {name: {'forecast': forecast_rows(prophet_data, forecast_future, 'LightGBM', trainer.model_version),
+                          'metrics': trainer.metrics[name]}
+                   for name, (prophet_data, forecast_future, _) in results.items()}
+        reports = {name: (*result, trainer.horizon) for name, result in results.items()}
+        errors = render_reports(reports, self.config.get('parallel_workers', 1))
+        return errors, outputs
+
+    def update_features(self, data, series_keys):
+        """Brings the feature table under feature_dir up to date; a failure here does not stop forecasting."""
         try:
-            model_params = self.state_model_configs.get(state_name)
-            if not model_params:
-                self.logger.warning(f"No specific config found for {state_name}, using defaults in Trainer.")
-            
-            trainer = ProphetTrainer(state_name, self.config_path, model_params)
-            prophet_data, forecast_future, prophet_data_pred = trainer.run(data)
-            
-            interactive_evalution(prophet_data, forecast_future, prophet_data_pred, state_name)
-            self.logger.info(f"{state_name} Completed ")
+            import importlib
+            build_features = importlib.import_module('Source.Feature generation.build_features')
+            build_features.FeatureStore(self.config_path, series_keys).update(data)
         except Exception as e:
-            self.logger.error(f"Error processing {state_name}: {e}", exc_info=True)
+            self.logger.error(f"Feature table not updated: {e}", exc_info=True)
 
-    def run(self):
-        """Orchestrates the entire SCM pipeline."""
-        self.logger.info("Main pipeline started.")
+    def _log_summary(self, errors):
+        failed = {name: error for name, error in errors.items() if error}
+        self.logger.info("---- Pipeline Summary ----")
+        for name, error in sorted(errors.items()):
+            status = f"FAILED ({error})" if error else "OK"
+            self.logger.info(f"{name}: {status}")
+        self.logger.info(f"{len(errors) - len(failed)} succeeded, {len(failed)} failed\n")
+
+    def run(self, stage='all'):
+        """Orchestrates the SCM pipeline up to `stage` ('load', 'clean', 'tune', 'backtest', 'hierarchy' or 'all')."""
+        self.logger.info(f"Main pipeline started (stage: {stage}).")
+        run_id = pd.Timestamp.now().strftime("%Y-%m-%d_%H-%M-%S")
         
         # 1. Load Data
         self.logger.info("Loading Data...")
         data_loader = DataLoader(self.config_path)
         raw_data = data_loader.load_raw_data()
         self.logger.info("Data Loading Completed.")
+        if stage == 'load':
+            return {}
 
         # 2. Clean Data
         self.logger.info("Cleaning Data...")
-        cleaner = DataCleaner(self.config_path)
-        # clean_data returns: data_GJ, data_CG, data_MH, data_TN, data
-        data_GJ, data_CG, data_MH, data_TN, data_all = cleaner.process_all(raw_data)
+        # The hierarchy needs the data aggregated down to its bottom level; that aggregation is
+        # kept in memory so the shared clean outputs and the feature table stay at series_keys
+        hierarchy = stage == 'hierarchy'
+        series_keys = self.config.get('hierarchy_levels', ['State', 'District']) if hierarchy else None
+        cleaner = DataCleaner(self.config_path, series_keys)
+        # clean_data returns: {series name: monthly data}, data
+        series_data, data_all = cleaner.process_all(raw_data, save=not hierarchy)
         self.logger.info("Cleaning Completed.")
+        if self.config.get('feature_store', True) and not hierarchy:
+            self.update_features(data_all, cleaner.series_keys)
+        if stage == 'clean':
+            return {}
+
+        # 3. Process Series
+        self.logger.info("Processing Series...")
+        if stage == 'tune':
+            from Source.Models.tune_prophet import ProphetTuner
+            return ProphetTuner(self.config_path, self.state_model_configs).run(series_data)
+        if stage == 'backtest':
+            from Source.Evalution.backtest import Backtester
+            return Backtester(self.config_path).run(series_data, self.state_model_configs)
+        if stage == 'hierarchy':
+            from Source.Models.hierarchy import HierarchicalForecaster
+            return HierarchicalForecaster(self.config_path).run(data_all)
+
+        if self.config.get('forecast_engine', 'prophet') == 'lightgbm':
+            errors, outputs = self.process_series_global(series_data)
+        else:
+            errors, outputs = self.process_series(series_data)
+        self._log_summary(errors)
 
-        # 3. Process States
-        self.logger.info("Processing States...")
-        self.process_state('Gujarat', data_GJ)
-        self.process_state('Maharashtra', data_MH)
-        self.process_state('Chattisgarh', data_CG)
-        self.process_state('TamilNadu', data_TN)
+        # 4. One indexed forecast table for every consumer, and the run's metrics in one batch;
+        # failed series have no output and keep their previous forecast
+        outputs = {name: output for name, output in outputs.items() if output is not None}
+        ForecastStore(self.config_path).materialize({name: output['forecast'] for name, output in outputs.items()}, run_id)
+        MetricsStore(self.config_path).write({name: output['metrics'] for name, output in outputs.items()}, run_id)
         
         self.logger.info("Main pipeline finished successfully.")
+        return errors
+
+def check_imports(config):
+    """Fails when a load/clean entry point imports too slowly or drags in training libraries."""
+    budget = config.get('import_budget_seconds', 1.0)
+    within_budget = True
+    for module in ('Source.Data.load_data', 'Source.Data.clean_data', 'main'):
+        report = check_import_budget(module, budget)
+        heavy = report['heavy_modules'] if module != 'main' else []
+        ok = report['within_budget'] and not heavy
+        within_budget &= ok
+        print(f"{'OK  ' if ok else 'FAIL'} {module}: {report['seconds']}s (budget {budget}s)"
+              + (f", imports {', '.join(heavy)}" if heavy else ""))
+    return within_budget
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mahalaabh SCM pipeline")
+    parser.add_argument('--stage', choices=['load', 'clean', 'tune', 'backtest', 'hierarchy', 'all'], default='all',
+                        help="Stop after this stage; load/clean never import the modelling libraries. "
+                             "'tune' searches Prophet parameters and writes state_model_configs, "
+                             "'backtest' stores out-of-sample accuracy in the metrics database, "
+                             "'hierarchy' forecasts and reconciles Total/State/District.")
+    parser.add_argument('--check-imports', action='store_true',
+                        help="Check the import-time budget of the entry points and exit.")
+    parser.add_argument('--migrate-metrics', action='store_true',
+                        help="Import the Model_Report CSVs into the metrics database and exit (safe to re-run).")
+    args = parser.parse_args()
+
     pipeline = SCMPipeline()
-    pipeline.run()
+    if args.check_imports:
+        sys.exit(0 if check_imports(pipeline.config) else 1)
+    if args.migrate_metrics:
+        MetricsStore(pipeline.config_path).migrate_csv_reports()
+        sys.exit(0)
+    pipeline.run(args.stage)
@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# Loggers write to a throwaway folder, so test runs never append to the tracked logs/*.log files.
+# Set at import time: modules create their loggers while the tests are being collected.
+LOG_DIR = tempfile.mkdtemp(prefix='scm-test-logs-')
+os.environ['SCM_LOG_DIR'] = LOG_DIR
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
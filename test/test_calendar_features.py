@@ -0,0 +1,62 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Source.Utils.helpers import add_calendar_features
+
+# Row-wise implementation add_calendar_features replaced (DataCleaner._clean_date_features)
+MONTH_MAPPING = {
+    "January": "Jan", "February": "Feb", "March": "March",
+    "April": "April", "May": "May", "June": "June",
+    "July": "July", "August": "Aug", "September": "Sep",
+    "October": "Oct", "November": "Nov", "December": "Dec"
+}
+
+
+def _financial_year(date):
+    if pd.isna(date):
+        return np.nan
+    fy_start = date.year - 1 if date.month < 4 else date.year
+    return f"{str(fy_start)[-2:]}-{str(fy_start + 1)[-2:]}"
+
+
+def _apply_calendar(df):
+    df = df.copy()
+    df['Month'] = df['Billing_Date'].dt.strftime("%B").map(MONTH_MAPPING)
+    df['Season'] = df['Month'].apply(lambda x: "Kharif" if x in ["April", "May", "June", "July", "Aug", "Sep"] else "Rabi")
+    df['FY'] = df['Billing_Date'].apply(_financial_year)
+    df['Num_Month'] = df['Billing_Date'].dt.month
+    df['Year'] = df['Billing_Date'].dt.year
+    return df
+
+
+def test_calendar_features_match_row_wise_apply():
+    rng = np.random.default_rng(0)
+    # Spans 1999 -> 2000 and 2009 -> 2010, where the two-digit FY labels roll over
+    dates = pd.to_datetime(rng.integers(pd.Timestamp('1998-01-01').value // 10**9,
+                                        pd.Timestamp('2026-12-31').value // 10**9, 20000), unit='s')
+    df = pd.DataFrame({'Billing_Date': dates, 'Inv_Qty': 1.0})
+
+    expected = _apply_calendar(df)
+    result = add_calendar_features(df.copy(), 'Billing_Date')
+
+    for column in ['Month', 'Season', 'FY']:
+        pd.testing.assert_series_equal(result[column].astype(object), expected[column].astype(object))
+    for column in ['Num_Month', 'Year']:
+        np.testing.assert_array_equal(result[column].to_numpy(), expected[column].to_numpy())
+
+
+def test_calendar_features_fiscal_year_boundaries():
+    df = pd.DataFrame({'Billing_Date': pd.to_datetime(['2024-03-31', '2024-04-01', '2000-01-15', '2099-12-31'])})
+    add_calendar_features(df, 'Billing_Date')
+    assert df['FY'].tolist() == ['23-24', '24-25', '99-00', '99-00']
+    assert df['Season'].tolist() == ['Rabi', 'Kharif', 'Rabi', 'Rabi']
+    assert df['Month'].tolist() == ['March', 'April', 'Jan', 'Dec']
+
+
+def test_calendar_features_missing_dates():
+    df = pd.DataFrame({'Billing_Date': pd.to_datetime(['2024-05-01', None])})
+    add_calendar_features(df, 'Billing_Date')
+    assert df.loc[0, 'Season'] == 'Kharif' and df.loc[0, 'Num_Month'] == 5
+    assert df.loc[1, ['Month', 'Season', 'FY', 'Num_Month', 'Year']].isna().all()
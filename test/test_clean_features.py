@@ -0,0 +1,34 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Source.Data.clean_data import DataCleaner
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Source', 'config.json'))
+
+MAT_DESCS = [
+    'Mahalaabh 25kg', ' Mahalaabh Gr 5kg ', 'MAHALAABH GR.', 'Potassium Schoenite 50kg',
+    'Potassium Schoenite (Boost-1kg )', 'Dripsafe', 'neem cake', 'Neem Oil 1L', 'Herbovita x',
+    'Quickact 500ml', 'unknown product', None, np.nan,
+]
+
+
+def test_classify_products_matches_row_wise_apply():
+    cleaner = DataCleaner(CONFIG_PATH)
+    rng = np.random.default_rng(0)
+    mat_desc = pd.Series(np.array(MAT_DESCS, dtype=object)[rng.integers(0, len(MAT_DESCS), 5000)],
+                         index=rng.permutation(5000) + 100, name='Mat_Desc')
+
+    expected = mat_desc.apply(cleaner._map_product_name)
+    result = cleaner._classify_products(mat_desc)
+
+    assert result.index.equals(mat_desc.index)
+    pd.testing.assert_series_equal(result.isna(), expected.isna(), check_names=False)
+    pd.testing.assert_series_equal(result[expected.notna()], expected[expected.notna()], check_names=False)
+
+
+def test_classify_products_empty_and_all_missing():
+    cleaner = DataCleaner(CONFIG_PATH)
+    assert cleaner._classify_products(pd.Series([], dtype=object)).empty
+    assert cleaner._classify_products(pd.Series([None, np.nan], dtype=object)).isna().all()
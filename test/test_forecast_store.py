@@ -0,0 +1,77 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import json
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Source.Models.forecast_store import ForecastStore, forecast_rows
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Source', 'config.json'))
+
+
+def _series(seed, history=24, horizon=6):
+    """Prophet-shaped actuals and a history + horizon forecast."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2022-01-01', periods=history + horizon, freq='MS')
+    prophet_data = pd.DataFrame({'ds': dates[:history], 'y': rng.random(history) * 100})
+    yhat = rng.random(history + horizon) * 100
+    forecast_future = pd.DataFrame({'ds': dates, 'yhat': yhat, 'yhat_lower': yhat - 10, 'yhat_upper': yhat + 10})
+    return prophet_data, forecast_future
+
+
+@pytest.fixture
+def store(tmp_path):
+    config = json.load(open(CONFIG_PATH))
+    config['forecast_db'] = str(tmp_path / 'forecasts.db')
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(config))
+    return ForecastStore(str(config_path))
+
+
+def test_forecast_rows():
+    prophet_data, forecast_future = _series(0)
+    rows = forecast_rows(prophet_data, forecast_future, 'Prophet', 'abc123')
+    assert len(rows) == 30 and rows['is_future'].sum() == 6
+    assert rows.loc[~rows['is_future'], 'y'].notna().all() and rows.loc[rows['is_future'], 'y'].isna().all()
+    assert (rows['model_version'] == 'abc123').all()
+
+
+def test_materialize_and_query_round_trip(store):
+    series_rows = {name: forecast_rows(*_series(seed), 'Prophet', f'v{seed}')
+                   for seed, name in enumerate(['All', 'Gujarat', 'Maharashtra'])}
+    assert store.materialize({**series_rows, 'Failed': None}, 'run1') == 90
+
+    everything = store.query([{'series': 'All'}, {'series': 'Gujarat'}, {'series': 'Maharashtra'}])
+    assert len(everything) == 90
+    stored = everything[everything['series'] == 'Gujarat'].reset_index(drop=True)
+    expected = series_rows['Gujarat']
+    np.testing.assert_allclose(stored['yhat'], expected['yhat'])
+    pd.testing.assert_series_equal(stored['ds'], expected['ds'], check_names=False, check_dtype=False)
+    assert stored['is_future'].astype(bool).tolist() == expected['is_future'].tolist()
+    assert (stored['run_id'] == 'run1').all() and (stored['model_version'] == 'v1').all()
+
+    # Date ranges are inclusive and combine with future_only per request
+    ranged = store.query([{'series': 'All', 'start': '2022-06-01', 'end': '2022-08-01'},
+                          {'series': 'Maharashtra', 'start': '2023-12-01'}])
+    assert ranged.groupby('series').size().to_dict() == {'All': 3, 'Maharashtra': 7}
+    future = store.query([{'series': 'All'}, {'series': 'Gujarat'}], future_only=True)
+    assert len(future) == 12 and (future['ds'] >= '2024-01-01').all()
+
+    assert store.query([{'series': 'Unknown'}]).empty
+    empty = store.query([])
+    assert empty.empty and 'yhat' in empty.columns
+
+
+def test_materialize_replaces_series_rows(store):
+    store.materialize({'All': forecast_rows(*_series(0), 'Prophet'), 'Gujarat': forecast_rows(*_series(1), 'Prophet')}, 'run1')
+    shorter = forecast_rows(*_series(2, history=12, horizon=3), 'Prophet')
+    store.materialize({'All': shorter}, 'run2')
+
+    rows = store.query([{'series': 'All'}, {'series': 'Gujarat'}])
+    assert rows.groupby('series')['run_id'].unique().map(list).to_dict() == {'All': ['run2'], 'Gujarat': ['run1']}
+    assert (rows['series'] == 'All').sum() == 15
+    np.testing.assert_allclose(rows.loc[rows['series'] == 'All', 'yhat'], shorter['yhat'])
+
+    assert store.materialize({'All': None}, 'run3') == 0
+    assert (store.query([{'series': 'All'}])['run_id'] == 'run2').all()
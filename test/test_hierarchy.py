@@ -0,0 +1,69 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Source.Models.hierarchy import build_hierarchy, reconcile, summing_matrix, TOTAL
+from Source.Utils.series import series_name
+
+
+@pytest.fixture
+def monthly():
+    rng = np.random.default_rng(0)
+    districts = {'Gujarat': ['Rajkot', 'Surat', 'Unmapped'], 'Maharashtra': ['Pune', 'Nashik'], 'Tamil Nadu': ['Salem']}
+    dates = pd.date_range('2022-01-01', periods=24, freq='MS')
+    rows = [(date, state, district, rng.random() * 100)
+            for state, names in districts.items() for district in names for date in dates
+            if rng.random() > 0.2]                      # Missing months become 0
+    return pd.DataFrame(rows, columns=['Date', 'State', 'District', 'QTY_MT'])
+
+
+def _assert_coherent(values, nodes, data):
+    """Total equals the sum of the states, and every state the sum of its districts."""
+    by_node = dict(zip(nodes['node'], values))
+    states = data[['State']].drop_duplicates()['State']
+    np.testing.assert_allclose(by_node[TOTAL], sum(by_node[series_name([state])] for state in states))
+    for state, districts in data.groupby('State')['District']:
+        children = sum(by_node[series_name([state, district])] for district in districts.unique())
+        np.testing.assert_allclose(by_node[series_name([state])], children)
+
+
+def test_build_hierarchy_aggregates(monthly):
+    Y, nodes, A = build_hierarchy(monthly, ['State', 'District'])
+    assert nodes['level'].tolist()[:4] == [TOTAL, 'State', 'State', 'State']
+    assert A.shape == (4, 6)
+    np.testing.assert_allclose(Y.loc[TOTAL].sum(), monthly['QTY_MT'].sum())
+    _assert_coherent(Y.to_numpy(), nodes, monthly)
+
+
+@pytest.mark.parametrize('method', ['bottom_up', 'ols', 'wls_struct'])
+def test_reconciled_children_sum_to_parents(monthly, method):
+    Y, nodes, A = build_hierarchy(monthly, ['State', 'District'])
+    base = np.random.default_rng(1).random((len(nodes), 3)) * 100     # Incoherent base forecasts
+    reconciled = reconcile(base, A, method)
+    assert reconciled.shape == base.shape
+    _assert_coherent(reconciled, nodes, monthly)
+
+
+@pytest.mark.parametrize('method', ['ols', 'wls_struct'])
+def test_woodbury_matches_dense_projection(monthly, method):
+    _, nodes, A = build_hierarchy(monthly, ['State', 'District'])
+    base = np.random.default_rng(2).random((len(nodes), 3)) * 100
+    S = summing_matrix(A)
+    weights = np.ones(len(S)) if method == 'ols' else 1.0 / S.sum(axis=1)
+    W = np.diag(weights)
+    expected = S @ np.linalg.solve(S.T @ W @ S, S.T @ W @ base)
+    np.testing.assert_allclose(reconcile(base, A, method), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_coherent_base_is_unchanged(monthly):
+    Y, _, A = build_hierarchy(monthly, ['State', 'District'])
+    for method in ('bottom_up', 'ols', 'wls_struct'):
+        np.testing.assert_allclose(reconcile(Y.to_numpy(), A, method), Y.to_numpy(), atol=1e-8)
+
+
+def test_unknown_method(monthly):
+    _, _, A = build_hierarchy(monthly, ['State', 'District'])
+    with pytest.raises(ValueError):
+        reconcile(np.zeros((A.shape[0] + A.shape[1], 1)), A, 'mint')
@@ -0,0 +1,61 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import json
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Source.Evalution.metrics_store import MetricsStore
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Source', 'config.json'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    config = json.load(open(CONFIG_PATH))
+    config['metrics_db'] = str(tmp_path / 'metrics.db')
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(config))
+    return MetricsStore(str(config_path))
+
+
+def test_write_trend_and_latest(store):
+    first = {'All': {'model': 'Prophet', 'MAE': 10.0, 'RMSE': 12.0, 'R2': 0.8},
+             'Gujarat': {'model': 'Prophet', 'MAE': 5.0, 'RMSE': 6.0, 'R2': 0.7},
+             'Failed': None}
+    assert store.write(first, '2025-01-01_10-00-00') == 2
+    assert store.write(first, '2025-01-01_10-00-00') == 0            # Re-writing a run is a no-op
+    assert store.write({'All': {'model': 'Prophet', 'MAE': 8.0, 'RMSE': 9.0, 'R2': 0.9}}, '2025-02-01_10-00-00') == 1
+    assert store.write({}, '2025-03-01_10-00-00') == 0
+
+    trend = store.trend('All')
+    assert trend['run_id'].tolist() == ['2025-01-01_10-00-00', '2025-02-01_10-00-00']
+    assert trend['MAE'].tolist() == [10.0, 8.0]
+    assert trend['recorded_at'].tolist() == [pd.Timestamp('2025-01-01 10:00'), pd.Timestamp('2025-02-01 10:00')]
+    assert len(store.trend('All', since='2025-01-15')) == 1
+    assert store.trend('All', model='LightGBM').empty
+
+    latest = store.latest().set_index('series')
+    assert latest.loc['All', 'MAE'] == 8.0 and latest.loc['Gujarat', 'MAE'] == 5.0
+    assert (latest['source'] == 'pipeline').all()
+
+
+def test_migrate_model_report_csvs(store):
+    # The shipped Model_Report CSVs: blank lines, repeated headers, trailing commas, appended forecast columns
+    inserted = store.migrate_csv_reports()
+    assert inserted == 141
+    assert store.migrate_csv_reports() == 0                            # Safe to re-run
+
+    latest = store.latest()
+    assert set(latest['series']) == {'All', 'Chattisgarh', 'Gujarat', 'Maharashtra', 'TamilNadu'}
+    assert set(latest['model']) == {'Prophet'}
+    assert (latest['source'] == 'csv').all()
+    assert latest[['MAE', 'RMSE']].notna().all().all() and latest['R2'].isna().all()
+
+    trend = store.trend('Gujarat')
+    assert trend['recorded_at'].is_monotonic_increasing
+    assert np.isfinite(trend['MAE']).all()
+
+    # Pipeline runs are stored alongside the migrated history
+    assert store.write({'Gujarat': {'model': 'Prophet', 'MAE': 1.0, 'RMSE': 2.0, 'R2': 0.5}}, '2030-01-01_00-00-00') == 1
+    assert store.latest().set_index('series').loc['Gujarat', 'source'] == 'pipeline'
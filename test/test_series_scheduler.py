@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Source.Utils.series import SeriesScheduler, partition_series, series_names
+
+
+def job(name, kind):
+    """Module level so worker processes can pickle it."""
+    if kind == 'error':
+        raise RuntimeError('boom')
+    if kind == 'exit':
+        os._exit(3)
+    if kind == 'hang':
+        time.sleep(60)
+    if kind == 'large':
+        return 'x' * 2_000_000                    # Larger than a pipe buffer
+    return (name.upper(), os.getpid())
+
+
+JOBS = {'a': ('ok',), 'b': ('error',), 'c': ('exit',), 'd': ('hang',), 'e': ('ok',), 'f': ('large',), 'g': ('ok',)}
+
+
+def test_errors_crashes_and_timeouts_are_isolated():
+    scheduler = SeriesScheduler(job, max_workers=3, timeout=3)
+    start = time.monotonic()
+    errors = scheduler.run(JOBS)
+
+    assert time.monotonic() - start < 30
+    assert set(errors) == set(JOBS)
+    assert errors['a'] is None and errors['e'] is None and errors['f'] is None and errors['g'] is None
+    assert errors['b'] == 'RuntimeError: boom'
+    assert errors['c'] == 'Worker exited with code 3'
+    assert errors['d'] == 'Timed out after 3s'
+
+    # Only successful series have an output; the workers are other processes
+    assert set(scheduler.outputs) == {'a', 'e', 'f', 'g'}
+    assert scheduler.outputs['a'][0] == 'A' and scheduler.outputs['a'][1] != os.getpid()
+    assert len(scheduler.outputs['f']) == 2_000_000
+
+
+def test_single_worker_runs_in_process():
+    scheduler = SeriesScheduler(job, max_workers=1)
+    errors = scheduler.run({'a': ('ok',), 'b': ('error',), 'c': ('ok',)})
+
+    assert errors == {'a': None, 'b': 'RuntimeError: boom', 'c': None}
+    assert scheduler.outputs == {'a': ('A', os.getpid()), 'c': ('C', os.getpid())}
+
+
+def test_no_jobs():
+    assert SeriesScheduler(job, max_workers=2).run({}) == {}
+
+
+def test_colliding_series_names_stay_unique():
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-01', '2024-02-01'] * 4),
+        'State': ['Gujarat'] * 6 + ['Tamil Nadu'] * 2,
+        'District': ['Salem', 'Salem', 'Salem.', 'Salem.', 'Sal em', 'Sal em', 'Salem', 'Salem'],
+        'QTY_MT': range(8),
+    })
+    series = partition_series(df, ['State', 'District'])
+
+    assert len(series) == 4 and 'TamilNadu_Salem' in series
+    gujarat = sorted(name for name in series if name.startswith('Gujarat_Salem_'))
+    assert len(gujarat) == 3
+    assert sorted(series[name]['District'].iloc[0] for name in gujarat) == ['Sal em', 'Salem', 'Salem.']
+    # Suffixes depend only on the key, not on which other series are present
+    assert series_names([('Gujarat', 'Salem.'), ('Gujarat', 'Salem')])[0] in gujarat